@@ -1,42 +1,79 @@
 import copy as cp
+from array import array
 from collections import deque
-import os
-
-# =============================================================================
-# CONFIGURATION IMPORTANTE : LE CHEMIN VERS GRAPHVIZ
-# =============================================================================
-# Colle ici le chemin vers le dossier 'bin' de Graphviz que tu as trouvé.
-# Garde le 'r' devant les guillemets pour éviter les erreurs de caractères spéciaux.
-GRAPHVIZ_PATH = r'C:\Program Files\Graphviz\bin' 
-
-# On ajoute ce chemin au système pour que Python le trouve
-if os.path.exists(GRAPHVIZ_PATH):
-    os.environ["PATH"] += os.pathsep + GRAPHVIZ_PATH
-else:
-    print(f"ATTENTION : Le chemin {GRAPHVIZ_PATH} n'existe pas.")
-    print("Veuillez vérifier l'installation de Graphviz ou modifier la variable GRAPHVIZ_PATH ligne 9.")
-
-# =============================================================================
-
-# Imports pour la génération de PDF et Graphes
-try:
-    from graphviz import Digraph
-    from fpdf import FPDF
-    from fpdf.enums import XPos, YPos 
-    GRAPHVIZ_AVAILABLE = True
-except ImportError:
-    GRAPHVIZ_AVAILABLE = False
-    print("ATTENTION: graphviz ou fpdf non installés. Le PDF ne sera pas généré.")
-    print("Faites: pip install graphviz fpdf2")
+from collections.abc import Mapping
+import hashlib
+import struct
+import sys
+import time
+
+# le rendu des automates (Graphviz) et le rapport PDF sont dans rendu.py:
+# ce module n'importe que la bibliothèque standard
+
+# caractères qui ne peuvent pas être des symboles: epsilon, automate vide,
+# opérateurs et blancs des expressions
+RESERVES = "EO()+*.&-~ \t\r\n"
+
+
+class Alphabet:
+    """
+    alphabet configurable: liste de symboles, chacun un caractère (un
+    alphabet d'octets s'écrit [chr(o) for o in range(256)] sans les
+    caractères réservés) ; le numéro d'un symbole est sa position
+    les caractères de RESERVES ne peuvent pas être des symboles
+    """
+
+    def __init__(self, symboles="abc"):
+        self.symboles = list(symboles)
+        self._presents = set()
+        for s in self.symboles:
+            if not isinstance(s, str) or len(s) != 1:
+                raise ValueError("un symbole doit être un caractère: " + repr(s))
+            if s in RESERVES:
+                raise ValueError(f"{s!r} est réservé et ne peut pas être un symbole")
+            if s in self._presents:
+                raise ValueError("symbole en double dans l'alphabet: " + repr(s))
+            self._presents.add(s)
+
+    def __len__(self):
+        return len(self.symboles)
+
+    def __iter__(self):
+        return iter(self.symboles)
+
+    def __contains__(self, s):
+        return s in self._presents
+
+    def classes(self, utilises):
+        """ compression de l'alphabet: classes de symboles que les expressions
+            ne distinguent pas; chaque symbole de utilises (ceux qui
+            apparaissent dans les expressions) forme sa propre classe, tous
+            les autres sont regroupés dans une dernière classe
+            retourne la liste des classes (listes de symboles)
+            (utilisée par parseur.compare, donc lot.egalites ; empreinte, le
+            cache et le stockage gardent l'alphabet complet, pour que leurs
+            résultats restent comparables d'une expression à l'autre)
+        """
+        res = [[s] for s in self.symboles if s in utilises]
+        reste = [s for s in self.symboles if s not in utilises]
+        if reste:
+            res.append(reste)
+        return res
+
+
+def representants(classes):
+    """ alphabet réduit: un symbole (le premier) par classe de symboles """
+    return [c[0] for c in classes]
+
 
 class automate:
     """
     classe de manipulation des automates
-    l'alphabet est l'ensemble des caractères alphabétiques minuscules et "E" pour epsilon, 
-    et "O" pour l'automate vide
+    l'alphabet est par défaut l'ensemble des caractères "abc" (voir Alphabet),
+    "E" pour epsilon, et "O" pour l'automate vide
     """
     
-    def __init__(self, expr="O"):
+    def __init__(self, expr="O", alphabet=None):
         """
         construit un automate élémentaire pour une expression régulière expr 
             réduite à un caractère de l'alphabet, ou automate vide si "O"
@@ -45,9 +82,10 @@ class automate:
         """
         
         # alphabet
-        self.alphabet = list("abc")
+        # (un alphabet donné est vérifié par Alphabet: caractères non réservés)
+        self.alphabet = list("abc") if alphabet is None else Alphabet(alphabet).symboles
         # l'expression doit contenir un et un seul caractère de l'alphabet
-        if expr not in (self.alphabet + ["O", "E"]):
+        if expr not in ("O", "E") and expr not in self.alphabet:
             raise ValueError("l'expression doit contenir un et un seul\
                            caractère de l'alphabet " + str(self.alphabet))
         # nombre d'états
@@ -94,57 +132,303 @@ class automate:
             self.transition.update({(q0, a): qlist})
 
     def to_graphviz(self, filename):
-        """ Génère une image de l'automate via Graphviz """
-        if not GRAPHVIZ_AVAILABLE:
-            return None
-        
-        try:
-            dot = Digraph(comment=self.name, format='png')
-            dot.attr(rankdir='LR') # De gauche à droite
-            
-            # Point invisible pour pointer vers l'état initial (0)
-            dot.node('start', style='invisible', shape='point')
-            dot.edge('start', '0')
-
-            # Création des noeuds
-            for i in range(self.n):
-                if i in self.final:
-                    dot.node(str(i), shape='doublecircle') # Etat final
-                else:
-                    dot.node(str(i), shape='circle') # Etat normal
-
-            # Création des arêtes (transitions)
-            for (src, char), dests in self.transition.items():
-                label = "ε" if char == "E" else char
-                for dest in dests:
-                    dot.edge(str(src), str(dest), label=label)
-            
-            # Rendu du fichier
-            # Graphviz ajoute automatiquement l'extension .png au nom de fichier
-            output_path = dot.render(filename, cleanup=True)
-            return output_path
-        except Exception as e:
-            print(f"\n[ERREUR] Impossible de générer l'image pour {filename}.")
-            print(f"Cause : {e}")
-            print("Vérifiez que le chemin GRAPHVIZ_PATH ligne 9 est correct.")
-            return None
+        """ Génère une image de l'automate via Graphviz (voir rendu.py) """
+        # import local: graphviz n'est chargé qu'au premier dessin
+        from rendu import to_graphviz
+        return to_graphviz(self, filename)
     
     
-def _clone_with_offset(a, offset):
-    """Clone l'automate a en renumérotant chaque état q -> q+offset.
-       Retourne un nouvel automate 'b' en tant qu'instance automatique (structure compatible)."""
-    b = automate()  # initial temporaire, on va remplacer champs
-    b = cp.deepcopy(b)
-    b.name = a.name
-    b.n = a.n + offset
-    # finals
-    b.final = [q + offset for q in a.final]
-    # transitions
-    b.transition = {}
+class _VueTransitions(Mapping):
+    """ vue en lecture seule des transitions d'un automate_compact
+        sous la forme habituelle: dico (état, caractère) -> liste d'états
+    """
+    __slots__ = ("_a",)
+
+    def __init__(self, a):
+        self._a = a
+
+    def __getitem__(self, cle):
+        q, c = cle
+        dests = self._a.destinations(q, c)
+        if not dests:
+            raise KeyError(cle)
+        return dests
+
+    def __iter__(self):
+        a = self._a
+        for q in range(a.n):
+            for c in a.symboles:
+                if a.destinations(q, c):
+                    yield (q, c)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class _VueFinals:
+    """ vue en lecture seule des états finals d'un automate_compact
+        test d'appartenance en O(1), se compare à une liste
+    """
+    __slots__ = ("_a",)
+
+    def __init__(self, a):
+        self._a = a
+
+    def __contains__(self, q):
+        return isinstance(q, int) and 0 <= q < self._a.n and self._a.finals[q] == 1
+
+    def __iter__(self):
+        finals = self._a.finals
+        return (q for q in range(len(finals)) if finals[q])
+
+    def __len__(self):
+        return self._a.finals.count(1)
+
+    def __eq__(self, autre):
+        return list(self) == list(autre)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class automate_compact:
+    """
+    représentation compacte d'un automate, sans dico ni tuples:
+    - les symboles sont numérotés de 0 à k-1 (symboles[s] -> caractère)
+    - automate déterministe: table plate array('i') de taille n*k,
+      table[q*k + s] = état d'arrivée ou -1
+    - sinon (CSR): les états d'arrivée de (q, s) sont
+      cibles[debuts[q*k + s] : debuts[q*k + s + 1]]
+    - états finals: bytearray de taille n (1 si final)
+    les attributs transition et final sont des vues en lecture seule,
+    ce qui permet de passer directement l'automate aux fonctions qui ne
+    font que lire leurs arguments (concatenation, determinisation, egal...)
+    """
+    __slots__ = ("name", "n", "alphabet", "symboles", "_code",
+                 "deterministe", "table", "debuts", "cibles", "finals")
+
+    def __init__(self, a):
+        """ construit la forme compacte de l'automate a (forme dico) """
+        self.name = a.name
+        self.n = a.n
+        self.alphabet = list(a.alphabet)
+        # symboles: ceux de l'alphabet, puis ceux qui n'apparaissent que
+        # dans les transitions (epsilon notamment)
+        self.symboles = list(a.alphabet)
+        for (_, c) in a.transition:
+            if c not in self.symboles:
+                self.symboles.append(c)
+        self._code = {c: s for s, c in enumerate(self.symboles)}
+        k = len(self.symboles)
+        self.deterministe = "E" not in self._code and \
+            all(len(dests) <= 1 for dests in a.transition.values())
+        if self.deterministe:
+            self.table = array("i", [-1]) * (self.n * k)
+            for (q, c), dests in a.transition.items():
+                if dests:
+                    self.table[q * k + self._code[c]] = dests[0]
+            self.debuts = self.cibles = None
+        else:
+            self.table = None
+            # nombre de destinations par case, puis sommes cumulées
+            debuts = array("i", [0]) * (self.n * k + 1)
+            for (q, c), dests in a.transition.items():
+                debuts[q * k + self._code[c] + 1] = len(dests)
+            for i in range(self.n * k):
+                debuts[i + 1] += debuts[i]
+            cibles = array("i", [0]) * debuts[self.n * k]
+            for (q, c), dests in a.transition.items():
+                i = debuts[q * k + self._code[c]]
+                cibles[i:i + len(dests)] = array("i", dests)
+            self.debuts = debuts
+            self.cibles = cibles
+        self.finals = bytearray(self.n)
+        for q in a.final:
+            self.finals[q] = 1
+
+    @property
+    def transition(self):
+        return _VueTransitions(self)
+
+    @property
+    def final(self):
+        return _VueFinals(self)
+
+    def destinations(self, q, c):
+        """ liste des états atteints depuis q en lisant c """
+        s = self._code.get(c)
+        if s is None or not 0 <= q < self.n:
+            return []
+        i = q * len(self.symboles) + s
+        if self.deterministe:
+            d = self.table[i]
+            return [] if d == -1 else [d]
+        return self.cibles[self.debuts[i]:self.debuts[i + 1]].tolist()
+
+    def vers_automate(self):
+        """ retourne l'automate équivalent sous forme dico (conversion sans perte) """
+        res = automate()
+        res.name = self.name
+        res.n = self.n
+        res.alphabet = list(self.alphabet)
+        res.final = list(self.final)
+        res.transition = {cle: self.transition[cle] for cle in self.transition}
+        return res
+
+    def vers_octets(self):
+        """ sérialisation binaire (petit-boutiste), relue par depuis_octets
+            en-tête: n, nombre de symboles, taille de l'alphabet, taille du nom,
+            drapeau déterministe; puis nom, symboles, finals, table ou CSR
+        """
+        nom = self.name.encode("utf-8")
+        symboles = symboles_vers_octets(self.symboles)
+        entete = struct.pack("<iiiiiB", self.n, len(self.symboles), len(self.alphabet),
+                             len(nom), len(symboles), self.deterministe)
+        tableaux = [self.table] if self.deterministe else [self.debuts, self.cibles]
+        corps = []
+        for t in tableaux:
+            if sys.byteorder != "little":
+                t = array("i", t)
+                t.byteswap()
+            corps.append(t.tobytes())
+        return b"".join([entete, nom, symboles, bytes(self.finals)] + corps)
+
+    @staticmethod
+    def depuis_octets(donnees):
+        """ reconstruit un automate_compact à partir de vers_octets() """
+        taille_entete = struct.calcsize("<iiiiiB")
+        n, k, nb_alpha, taille_nom, taille_sym, deterministe = \
+            struct.unpack_from("<iiiiiB", donnees)
+        i = taille_entete
+        res = object.__new__(automate_compact)
+        res.name = bytes(donnees[i:i + taille_nom]).decode("utf-8")
+        i += taille_nom
+        res.symboles = list(bytes(donnees[i:i + taille_sym]).decode("utf-8"))
+        i += taille_sym
+        res.alphabet = res.symboles[:nb_alpha]
+        res._code = {c: s for s, c in enumerate(res.symboles)}
+        res.n = n
+        res.deterministe = bool(deterministe)
+        res.finals = bytearray(donnees[i:i + n])
+        i += n
+
+        def lit(nb):
+            nonlocal i
+            t = array("i")
+            t.frombytes(bytes(donnees[i:i + 4 * nb]))
+            if sys.byteorder != "little":
+                t.byteswap()
+            i += 4 * nb
+            return t
+
+        if res.deterministe:
+            res.table = lit(n * k)
+            res.debuts = res.cibles = None
+        else:
+            res.table = None
+            res.debuts = lit(n * k + 1)
+            res.cibles = lit(res.debuts[n * k])
+        return res
+
+    __str__ = automate.__str__
+
+
+def symboles_vers_octets(symboles):
+    """ symboles (un caractère chacun, epsilon compris) écrits bout à bout en
+        utf-8, relus par list(octets.decode("utf-8")) ; lève ValueError pour
+        un symbole qui n'est pas un caractère
+    """
+    for c in symboles:
+        if not isinstance(c, str) or len(c) != 1:
+            raise ValueError("symbole non sérialisable (un caractère attendu): " + repr(c))
+    return "".join(symboles).encode("utf-8")
+
+
+def compacter(a):
+    """ retourne la forme compacte (automate_compact) de l'automate a """
+    return automate_compact(a)
+
+
+def _copie_modifiable(a):
+    """ copie de a sous forme dico, que l'on peut modifier sans effet de bord """
+    if isinstance(a, automate_compact):
+        return a.vers_automate()
+    if type(a) is automate:
+        # copie superficielle et listes recopiées: bien plus rapide que deepcopy
+        res = cp.copy(a)
+        res.transition = {clef: list(dests) for clef, dests in a.transition.items()}
+        res.final = list(a.final)
+        res.alphabet = list(a.alphabet)
+        return res
+    return cp.deepcopy(a)
+
+
+def _nb_transitions(a):
+    return sum(len(dests) for dests in a.transition.values())
+
+
+class Statistiques:
+    """
+    mesures par étape de tout_faire, egal et egal_union_find: on passe un
+    objet Statistiques en paramètre stats, chaque étape y ajoute un dico
+    (etape, temps, etats_entree, transitions_entree, etats_sortie,
+    transitions_sortie, et les mesures propres à l'étape)
+    rappel: fonction éventuelle appelée avec chaque dico dès qu'il est ajouté
+    sans paramètre stats (None), rien n'est mesuré
+    """
+
+    def __init__(self, rappel=None):
+        self.etapes = []
+        self.rappel = rappel
+
+    def ajoute(self, etape, debut, entrees, sortie=None, **details):
+        """ enregistre une étape commencée à debut (time.perf_counter()),
+            entrees: tuple des automates d'entrée, sortie: automate produit
+        """
+        m = {"etape": etape, "temps": time.perf_counter() - debut}
+        if len(entrees) == 1:
+            m["etats_entree"] = entrees[0].n
+            m["transitions_entree"] = _nb_transitions(entrees[0])
+        else:
+            m["etats_entree"] = [a.n for a in entrees]
+            m["transitions_entree"] = [_nb_transitions(a) for a in entrees]
+        if sortie is not None:
+            m["etats_sortie"] = sortie.n
+            m["transitions_sortie"] = _nb_transitions(sortie)
+        m.update(details)
+        self.etapes.append(m)
+        if self.rappel is not None:
+            self.rappel(m)
+
+    def __getitem__(self, etape):
+        """ dernière mesure de l'étape """
+        for m in reversed(self.etapes):
+            if m["etape"] == etape:
+                return m
+        raise KeyError(etape)
+
+    def __str__(self):
+        res = "Statistiques\n"
+        for m in self.etapes:
+            res += ", ".join(f"{k}={v}" for k, v in m.items()) + "\n"
+        return res + "*********************************"
+
+
+def _copie_transitions(a, res, offset):
+    """ ajoute à res les transitions de a, chaque état q devenant q+offset
+        (une seule copie des listes, sans deepcopy)
+    """
     for (q, c), dests in a.transition.items():
-        b.transition[(q + offset, c)] = [d + offset for d in dests]
-    b.alphabet = list(a.alphabet)
-    return b
+        res.transition[(q + offset, c)] = [d + offset for d in dests]
+
+
+def _alphabet_commun(a1, a2):
+    """ alphabet de a1 complété par les symboles de a2 qui n'y sont pas """
+    if a1.alphabet == a2.alphabet:
+        return list(a1.alphabet)
+    deja = set(a1.alphabet)
+    return list(a1.alphabet) + [c for c in a2.alphabet if c not in deja]
+
 
 def concatenation(a1, a2): 
     """Retourne l'automate qui reconnaît la concaténation des 
@@ -155,28 +439,23 @@ def concatenation(a1, a2):
     # si a2 est vide => vide
     if a2.final == []:
         return cp.deepcopy(a2)
-    # clone a2 avec offset
+    # a2 est renuméroté avec offset
     offset = a1.n
-    b2 = _clone_with_offset(a2, offset)
     res = automate()
-    res = cp.deepcopy(res)
     # nom
     res.name = "(" + a1.name + "." + a2.name + ")"
     # états totaux
     res.n = a1.n + a2.n
-    # finals = finals de b2 renommé
-    res.final = list(b2.final)
+    # finals = finals de a2 renommés
+    res.final = [q + offset for q in a2.final]
     # trans = union des transitions (copie)
-    res.transition = {}
-    for k,v in a1.transition.items():
-        res.transition[k] = list(v)
-    for k,v in b2.transition.items():
-        res.transition[k] = list(v)
+    _copie_transitions(a1, res, 0)
+    _copie_transitions(a2, res, offset)
     # ajouter epsilon transitions des finals de a1 vers le start renommé (offset + 0)
     for f in a1.final:
         res.ajoute_transition(f, "E", [offset + 0])
-    # alphabet (on garde a1.alphabet standard)
-    res.alphabet = list(a1.alphabet)
+    # alphabet: celui de a1, complété par celui de a2
+    res.alphabet = _alphabet_commun(a1, a2)
     return res
 
 
@@ -190,31 +469,25 @@ def union(a1, a2):
         return cp.deepcopy(a1)
     # renumérotation: on va créer un nouvel état 0 (start), puis a1 puis a2 puis état final
     offset1 = 1
-    b1 = _clone_with_offset(a1, offset1)
     offset2 = offset1 + a1.n
-    b2 = _clone_with_offset(a2, offset2)
     # nouvel automate
     res = automate()
-    res = cp.deepcopy(res)
     res.name = "(" + a1.name + "+" + a2.name + ")"
     # nouvel état final
     final_index = offset2 + a2.n
     res.n = final_index + 1
     # transitions = union des transitions
-    res.transition = {}
-    for k,v in b1.transition.items():
-        res.transition[k] = list(v)
-    for k,v in b2.transition.items():
-        res.transition[k] = list(v)
-    # ajouter epsilon du nouvel état 0 vers starts de b1 et b2
-    res.ajoute_transition(0, "E", [b1_index := 0 + offset1, b2_index := 0 + offset2])
-    # epsilon des finals de b1 et b2 vers final_index
-    for f in b1.final:
-        res.ajoute_transition(f, "E", [final_index])
-    for f in b2.final:
-        res.ajoute_transition(f, "E", [final_index])
+    _copie_transitions(a1, res, offset1)
+    _copie_transitions(a2, res, offset2)
+    # ajouter epsilon du nouvel état 0 vers starts de a1 et a2
+    res.ajoute_transition(0, "E", [0 + offset1, 0 + offset2])
+    # epsilon des finals de a1 et a2 vers final_index
+    for f in a1.final:
+        res.ajoute_transition(f + offset1, "E", [final_index])
+    for f in a2.final:
+        res.ajoute_transition(f + offset2, "E", [final_index])
     res.final = [final_index]
-    res.alphabet = list(a1.alphabet)
+    res.alphabet = _alphabet_commun(a1, a2)
     return res
 
 
@@ -224,137 +497,456 @@ def etoile(a):
     # cas particulier: O* = {epsilon}
     if a.final == []:
         # construire un automate qui accepte epsilon
-        b = automate("E")
+        b = automate("E", a.alphabet)
         return b
     # on crée nouvel état 0 (start) et état final f en fin
     offset = 1
-    b = _clone_with_offset(a, offset)
     new_final = offset + a.n
     res = automate()
-    res = cp.deepcopy(res)
     res.name = "(" + a.name + ")*"
     res.n = new_final + 1
     # copier transitions
-    res.transition = {}
-    for k,v in b.transition.items():
-        res.transition[k] = list(v)
-    # epsilon du nouvel état 0 vers le start de b et vers new_final
+    _copie_transitions(a, res, offset)
+    # epsilon du nouvel état 0 vers le start de a et vers new_final
     res.ajoute_transition(0, "E", [offset + 0, new_final])
-    # epsilon des finals de b vers start de b et vers new_final
-    for f in b.final:
-        res.ajoute_transition(f, "E", [offset + 0, new_final])
+    # epsilon des finals de a vers start de a et vers new_final
+    for f in a.final:
+        res.ajoute_transition(f + offset, "E", [offset + 0, new_final])
     res.final = [new_final]
     res.alphabet = list(a.alphabet)
     return res
 
 
+class automate_paresseux:
+    """
+    automate dont les états sont découverts à la demande à partir de l'état
+    initial (produits, complément): chaque sous-classe donne depart(),
+    successeurs(x, c) et est_final(x), où un état x est une clef quelconque
+    (paire d'états, ensemble d'états...)
+    les attributs n, final et transition construisent, au premier accès,
+    l'automate ordinaire des seuls états accessibles (état 0 = depart()),
+    ce qui permet de passer l'automate aux autres fonctions (tout_faire,
+    egal, concatenation...) ; vide(a) n'a besoin que des successeurs
+    """
+
+    def __init__(self, name, alphabet):
+        self.name = name
+        self.alphabet = alphabet
+        self._explore = None
+
+    def _automate(self):
+        if self._explore is None:
+            res = automate(alphabet=self.alphabet)
+            res.name = self.name
+            symboles = [c for c in self.alphabet if c != "E"]
+            depart = self.depart()
+            numero = {depart: 0}
+            cles = [depart]
+            q = 0
+            while q < len(cles):
+                x = cles[q]
+                if self.est_final(x):
+                    res.final.append(q)
+                for c in symboles:
+                    dests = []
+                    for y in self.successeurs(x, c):
+                        if y not in numero:
+                            numero[y] = len(cles)
+                            cles.append(y)
+                        dests.append(numero[y])
+                    if dests:
+                        res.transition[(q, c)] = dests
+                q += 1
+            res.n = len(cles)
+            self._explore = res
+        return self._explore
+
+    @property
+    def n(self):
+        return self._automate().n
+
+    @property
+    def final(self):
+        return self._automate().final
+
+    @property
+    def transition(self):
+        return self._automate().transition
+
+    __str__ = automate.__str__
+    to_graphviz = automate.to_graphviz
+
+
+class _VueAutomate(automate_paresseux):
+    """ un automate ordinaire vu comme automate_paresseux (sans epsilon
+        transitions, supprimées si besoin) """
+
+    def __init__(self, a):
+        if any(c == "E" and dests for (q, c), dests in a.transition.items()):
+            a = supression_epsilon_transitions(a)
+        super().__init__(a.name, list(a.alphabet))
+        self._explore = a
+        self._finals = set(a.final)
+
+    def depart(self):
+        return 0
+
+    def successeurs(self, q, c):
+        return self._explore.transition.get((q, c), [])
+
+    def est_final(self, q):
+        return q in self._finals
+
+
+def _paresseux(a):
+    return a if isinstance(a, automate_paresseux) else _VueAutomate(a)
+
+
+class _Intersection(automate_paresseux):
+    """ produit de deux automates: paires (état de a1, état de a2) """
+
+    def __init__(self, a1, a2):
+        super().__init__("(" + a1.name + "&" + a2.name + ")", _alphabet_commun(a1, a2))
+        self._a1 = _paresseux(a1)
+        self._a2 = _paresseux(a2)
+
+    def depart(self):
+        return (self._a1.depart(), self._a2.depart())
+
+    def successeurs(self, x, c):
+        dests2 = self._a2.successeurs(x[1], c)
+        if not dests2:
+            return []
+        return [(p, q) for p in self._a1.successeurs(x[0], c) for q in dests2]
+
+    def est_final(self, x):
+        return self._a1.est_final(x[0]) and self._a2.est_final(x[1])
+
+
+class _Complement(automate_paresseux):
+    """ déterminisation à la demande de a, états finals inversés:
+        états = ensembles (frozenset) d'états de a, l'ensemble vide compris
+        (l'automate obtenu est déterministe et complet)
+    """
+
+    def __init__(self, a, alphabet):
+        super().__init__("~(" + a.name + ")", alphabet)
+        self._a = _paresseux(a)
+
+    def depart(self):
+        return frozenset([self._a.depart()])
+
+    def successeurs(self, X, c):
+        res = set()
+        for x in X:
+            res.update(self._a.successeurs(x, c))
+        return [frozenset(res)]
+
+    def est_final(self, X):
+        return not any(self._a.est_final(x) for x in X)
+
+
+def intersection(a1, a2):
+    """Retourne l'automate qui reconnaît l'intersection des langages
+    reconnus par les automates a1 et a2 (produit construit à la demande,
+    seules les paires d'états accessibles sont créées)"""
+    return _Intersection(a1, a2)
+
+
+def complement(a, alphabet=None):
+    """Retourne l'automate qui reconnaît le complémentaire du langage
+    reconnu par a, parmi les mots sur alphabet (par défaut celui de a)
+    (déterminisation construite à la demande)"""
+    if alphabet is None:
+        alphabet = a.alphabet
+    return _Complement(a, [c for c in alphabet if c != "E"])
+
+
+def difference(a1, a2):
+    """Retourne l'automate qui reconnaît les mots de a1 qui ne sont pas
+    reconnus par a2 (produit de a1 et du complémentaire de a2, construit
+    à la demande)"""
+    res = _Intersection(a1, _Complement(a2, [c for c in _alphabet_commun(a1, a2) if c != "E"]))
+    res.name = "(" + a1.name + "-" + a2.name + ")"
+    return res
+
+
+def composantes_fortement_connexes(succ):
+    """ composantes fortement connexes du graphe succ (succ[q] = successeurs
+        de q), par l'algorithme de Tarjan en parcours itératif
+        retourne (comp, membres): comp[q] = numéro de la composante de q,
+        membres[i] = états de la composante i ; les composantes sont
+        numérotées dans l'ordre où Tarjan les termine (une composante après
+        toutes celles qu'elle atteint)
+    """
+    n = len(succ)
+    index = [-1] * n
+    low = [0] * n
+    sur_pile = [False] * n
+    pile = []
+    comp = [-1] * n
+    membres = []
+    compteur = 0
+    for racine in range(n):
+        if index[racine] != -1:
+            continue
+        # parcours en profondeur itératif: (état, indice du prochain successeur)
+        index[racine] = low[racine] = compteur
+        compteur += 1
+        pile.append(racine)
+        sur_pile[racine] = True
+        travail = [(racine, 0)]
+        while travail:
+            q, k = travail[-1]
+            if k < len(succ[q]):
+                travail[-1] = (q, k + 1)
+                r = succ[q][k]
+                if index[r] == -1:
+                    index[r] = low[r] = compteur
+                    compteur += 1
+                    pile.append(r)
+                    sur_pile[r] = True
+                    travail.append((r, 0))
+                elif sur_pile[r]:
+                    low[q] = min(low[q], index[r])
+                continue
+            travail.pop()
+            if travail:
+                p = travail[-1][0]
+                low[p] = min(low[p], low[q])
+            if low[q] == index[q]:
+                # q est la racine d'une composante: on la dépile
+                num = len(membres)
+                liste = []
+                while True:
+                    r = pile.pop()
+                    sur_pile[r] = False
+                    comp[r] = num
+                    liste.append(r)
+                    if r == q:
+                        break
+                membres.append(liste)
+    return comp, membres
+
+
+def fermetures_epsilon(a):
+    """ retourne pour chaque état la liste triée des états accessibles par
+        epsilon transitions (lui compris)
+        les composantes fortement connexes du graphe des epsilon transitions
+        sont calculées par composantes_fortement_connexes, puis les
+        fermetures sont propagées dans l'ordre topologique inverse: un seul
+        parcours pour tous les états, et les états d'une même composante
+        partagent la même liste ; le coût suit la taille des fermetures, pas
+        le nombre d'états
+    """
+    succ = [[] for _ in range(a.n)]
+    for (q, c), dests in a.transition.items():
+        if c == "E":
+            succ[q].extend(dests)
+    comp, membres = composantes_fortement_connexes(succ)
+    # les composantes atteintes par la composante num sont déjà calculées
+    fermeture_comp = []
+    for num, liste in enumerate(membres):
+        fermeture = set(liste)
+        atteintes = {num}
+        for r in liste:
+            for t in succ[r]:
+                if comp[t] not in atteintes:
+                    atteintes.add(comp[t])
+                    fermeture.update(fermeture_comp[comp[t]])
+        fermeture_comp.append(sorted(fermeture))
+    return [fermeture_comp[comp[q]] for q in range(a.n)]
+
+
+def _bits_vers_liste(bits):
+    """ liste croissante des positions des bits à 1 de l'entier bits """
+    # écriture binaire à l'envers (sans le préfixe "0b"): le caractère q est le bit q
+    return [q for q, b in enumerate(bin(bits)[:1:-1]) if b == "1"]
+
+
 def acces_epsilon(a):
     """ retourne la liste pour chaque état des états accessibles par epsilon
         transitions pour l'automate a
         res[i] est la liste des états accessible pour l'état i
+        (res[i][0] == i, les listes sont construites à partir de fermetures_epsilon)
     """
-    # on initialise la liste résultat qui contient au moins l'état i pour chaque état i
-    res = [[i] for i in range(a.n)]
-    for i in range(a.n):
-        candidats = list(range(i)) + list(range(i+1, a.n))
-        new = [i]
-        while True:
-            # liste des epsilon voisins des états ajoutés en dernier:
-            voisins_epsilon = []
-            for e in new:
-                if (e, "E") in a.transition.keys():
-                    voisins_epsilon += [j for j in a.transition[(e, "E")]]
-            # on calcule la liste des nouveaux états:
-            new = list(set(voisins_epsilon) & set(candidats))
-            # si la nouvelle liste est vide on arrête:
-            if new == []:
-                break
-            # sinon on retire les nouveaux états ajoutés aux états candidats
-            candidats = list(set(candidats) - set(new))
-            res[i] += new 
+    res = []
+    for i, fermeture in enumerate(fermetures_epsilon(a)):
+        res.append([i] + [q for q in fermeture if q != i])
     return res
 
 
-def supression_epsilon_transitions(a):
+def supression_epsilon_transitions(a, stats=None):
     """ retourne l'automate équivalent sans epsilon transitions
+        l'état i reçoit les transitions de tous les états de sa fermeture
+        epsilon; les listes d'arrivée sont sans doublon et triées
     """
-    # on copie pour éviter les effets de bord     
-    a = cp.deepcopy(a)
+    if stats is not None:
+        debut = time.perf_counter()
     res = automate()
     res.name = a.name
     res.n = a.n
-    res.final = a.final
+    res.alphabet = list(a.alphabet)
     # pour chaque état on calcule les états auxquels il accède
-    # par epsilon transitions.
-    acces = acces_epsilon(a)
-    # on retire toutes les epsilon transitions
-    res.transition = {c: j for c, j in a.transition.items() if c[1] != "E"}
+    # par epsilon transitions
+    acces = fermetures_epsilon(a)
+    finals = set(a.final)
+    # transitions sortantes (hors epsilon) indexées par état de départ
+    sortantes = [[] for _ in range(a.n)]
+    for (q, c), dests in a.transition.items():
+        if c != "E" and dests:
+            sortantes[q].append((c, dests))
+    res.final = []
     for i in range(a.n):
-        # on ajoute i dans les états finals si accès à un état final:
-        if (set(acces[i]) & set(a.final)):
-            if i not in res.final:
-                res.final.append(i)
-        # on ajoute les nouvelles transitions en parcourant toutes les transitions
-        for c, v in a.transition.items():
-            if c[1] != "E" and c[0] in acces[i]:
-                res.ajoute_transition(i, c[1], v)
+        # i est final s'il accède à un état final
+        if any(q in finals for q in acces[i]):
+            res.final.append(i)
+        # union des transitions des états de la fermeture de i, par lettre
+        dest = {}
+        for q in acces[i]:
+            for c, dests in sortantes[q]:
+                dest.setdefault(c, set()).update(dests)
+        for c, d in dest.items():
+            res.transition[(i, c)] = sorted(d)
+    if stats is not None:
+        stats.ajoute("supression_epsilon", debut, (a,), res)
     return res
         
         
-def determinisation(a):
+# au-delà de ce nombre d'états du NFA, determinisation code les ensembles
+# d'états par des frozenset plutôt que par des entiers
+SEUIL_BITS = 2048
+
+
+def determinisation(a, stats=None):
     """ retourne l'automate équivalent déterministe
         la construction garantit que tous les états sont accessibles
         automate d'entrée sans epsilon-transitions
+        les ensembles d'états du NFA sont codés par des entiers (bit q à 1
+        si q est dans l'ensemble) tant que le NFA a au plus SEUIL_BITS
+        états: l'union est alors un "ou" par état, bien plus rapide quand
+        les ensembles sont gros (famille (a+b)*a(a+b)^n) ; mais un entier
+        occupe la place de son plus grand état, n/8 octets même pour un
+        ensemble de deux états: pour les grands NFA (longues
+        concaténations, ensembles petits) on utilise des frozenset
+        stats: mesure aussi le plus grand ensemble d'états du NFA rencontré
+    """
+    if stats is not None:
+        debut = time.perf_counter()
+    alpha = a.alphabet
+    # succ[c][q] = liste des successeurs de q par c
+    succ = {c: [[] for _ in range(a.n)] for c in alpha}
+    for (q, c), dests in a.transition.items():
+        if c in succ:
+            succ[c][q].extend(dests)
+    if a.n <= SEUIL_BITS:
+        trans, finals, ensembles = _sous_ensembles_bits(a, alpha, succ)
+    else:
+        trans, finals, ensembles = _sous_ensembles_frozenset(a, alpha, succ)
+    # construction du nouvel automate déterministe
+    res = automate()
+    res.name = a.name
+    res.n = len(trans)
+    res.transition = {}
+    for s, m in enumerate(trans):
+        for c, d in m.items():
+            # stockage sous la forme attendue: liste d'un élément
+            res.transition[(s, c)] = [d]
+    res.final = finals
+    res.alphabet = list(alpha)
+    if stats is not None:
+        taille = max(len(S) if isinstance(S, frozenset) else bin(S).count("1") for S in ensembles)
+        stats.ajoute("determinisation", debut, (a,), res, plus_grand_sous_ensemble=taille)
+    return res
+
+
+def _sous_ensembles_bits(a, alpha, succ):
+    """ parcours des ensembles accessibles, codés en entiers: retourne
+        (transitions de chaque état du DFA, états finals, ensembles
+        rencontrés)
     """
-    # mapping: frozenset(d'états NFA) -> état int dans DFA
-    start_set = frozenset([0])  # état initial 0 dans la convention NFA (ici on suppose pas d'epsilons)
-    # cependant si epsilon transitions existaient, supression_epsilon_transitions doit être appelée avant
-    # on va quand même chercher l'ensemble initial comme {0}
+    # masques des successeurs: chacun occupe au plus SEUIL_BITS / 8 octets
+    masques = {}
+    for c in alpha:
+        liste = []
+        for dests in succ[c]:
+            bits = 0
+            for d in dests:
+                bits |= 1 << d
+            liste.append(bits)
+        masques[c] = liste
+    masque_finals = 0
+    for q in a.final:
+        masque_finals |= 1 << q
+    # mapping: ensemble (entier) d'états NFA -> état int dans DFA
+    # état initial 0 dans la convention NFA (on suppose pas d'epsilons,
+    # supression_epsilon_transitions doit être appelée avant)
+    start_set = 1
     mapping = {start_set: 0}
-    inv = [start_set]
-    trans = {}
+    trans = []
     finals = []
     queue = deque([start_set])
     while queue:
         S = queue.popleft()
         sid = mapping[S]
-        trans.setdefault(sid, {})
-        # pour chaque symbole de l'alphabet
-        for c in a.alphabet:
-            dest_set = set()
-            for q in S:
-                dests = a.transition.get((q, c), [])
-                for d in dests:
-                    dest_set.add(d)
-            dest_fs = frozenset(dest_set)
-            if dest_fs not in mapping:
-                mapping[dest_fs] = len(inv)
-                inv.append(dest_fs)
-                queue.append(dest_fs)
-            trans[sid][c] = mapping[dest_fs]
+        # union des successeurs: un "ou" par état de S et par lettre
+        dest = dict.fromkeys(alpha, 0)
+        reste = S
+        while reste:
+            bit = reste & -reste
+            q = bit.bit_length() - 1
+            reste ^= bit
+            for c in alpha:
+                dest[c] |= masques[c][q]
+        ligne = {}
+        for c in alpha:
+            D = dest[c]
+            if D not in mapping:
+                mapping[D] = len(mapping)
+                queue.append(D)
+            ligne[c] = mapping[D]
+        trans.append(ligne)
         # finals: si S contient un état final du NFA
-        if any((q in a.final) for q in S):
+        if S & masque_finals:
             finals.append(sid)
-    # construction du nouvel automate déterministe
-    res = automate()
-    res = cp.deepcopy(res)
-    res.name = a.name
-    res.n = len(inv)
-    res.transition = {}
-    for s, m in trans.items():
-        for c, dest in m.items():
-            # stockage sous la forme attendue: liste d'un élément
-            res.transition[(s, c)] = [dest]
-    res.final = list(set(finals))
-    res.alphabet = list(a.alphabet)
-    return res
+    return trans, finals, mapping
+
+
+def _sous_ensembles_frozenset(a, alpha, succ):
+    """ même parcours que _sous_ensembles_bits, ensembles codés en frozenset """
+    finals_nfa = set(a.final)
+    start_set = frozenset([0])
+    mapping = {start_set: 0}
+    trans = []
+    finals = []
+    queue = deque([start_set])
+    while queue:
+        S = queue.popleft()
+        sid = mapping[S]
+        ligne = {}
+        for c in alpha:
+            liste = succ[c]
+            D = set()
+            for q in S:
+                D.update(liste[q])
+            D = frozenset(D)
+            if D not in mapping:
+                mapping[D] = len(mapping)
+                queue.append(D)
+            ligne[c] = mapping[D]
+        trans.append(ligne)
+        if not finals_nfa.isdisjoint(S):
+            finals.append(sid)
+    return trans, finals, mapping
     
     
-def completion(a):
+def completion(a, stats=None):
     """ retourne l'automate a complété
         l'automate en entrée doit être déterministe
     """
-    res = cp.deepcopy(a)
+    if stats is not None:
+        debut = time.perf_counter()
+    res = _copie_modifiable(a)
     # vérifier chaque paire (q,c)
     sink = None
     for q in range(res.n):
@@ -368,18 +960,25 @@ def completion(a):
                     # incrémenter le nombre d'états
                     res.n = sink + 1
                 res.transition[(q, c)] = [sink]
+    if stats is not None:
+        stats.ajoute("completion", debut, (a,), res)
     return res
 
 
-def minimisation(a):
+def minimisation(a, stats=None):
     """ retourne l'automate minimum
         a doit être déterministe complet
         algo par raffinement de partition (algo de Moore)
+        stats: mesure aussi le nombre de tours de raffinement
     """
+    if stats is not None:
+        debut = time.perf_counter()
+    entree = a
     # on copie pour éviter les effets de bord     
     a = cp.deepcopy(a)
     res = automate()
     res.name = a.name
+    res.alphabet = list(a.alphabet)
     
     # Étape 1 : partition initiale = finaux / non finaux
     part = [set(a.final), set(range(a.n)) - set(a.final)]
@@ -387,8 +986,10 @@ def minimisation(a):
     part = [e for e in part if e != set()]  
     
     # Étape 2 : raffinement jusqu’à stabilité
+    tours = 0
     modif = True
     while modif:
+        tours += 1
         modif = False
         new_part = []
         for e in part:
@@ -433,25 +1034,136 @@ def minimisation(a):
         for c in a.alphabet:
             q = a.transition[(representant, c)][0]
             res.transition[(i, c)] = [mapping[q]]
+    if stats is not None:
+        stats.ajoute("minimisation", debut, (entree,), res, tours=tours)
+    return res
+
+
+def minimisation_hopcroft(a, stats=None):
+    """ retourne l'automate minimum
+        a doit être déterministe complet
+        algo de Hopcroft: raffinement par une file de séparateurs,
+        en ne traitant que la plus petite moitié de chaque bloc coupé
+        O(n.|alphabet|.log n) au lieu de O(n.|alphabet|.|part|) par tour pour Moore
+        stats: mesure aussi le nombre de séparateurs traités (tours)
+    """
+    if stats is not None:
+        debut = time.perf_counter()
+    tours = 0
+    res = automate()
+    res.name = a.name
+    res.alphabet = list(a.alphabet)
+    n = a.n
+
+    # index inverse: pred[c][q] = liste des états p tels que p --c--> q
+    pred = {c: [[] for _ in range(n)] for c in a.alphabet}
+    for (q, c), dests in a.transition.items():
+        if c in pred:
+            pred[c][dests[0]].append(q)
+
+    # Étape 1 : partition initiale = finaux / non finaux
+    finals = set(a.final)
+    blocs = [e for e in (finals, set(range(n)) - finals) if e]
+    bloc_de = [0] * n
+    for i, e in enumerate(blocs):
+        for q in e:
+            bloc_de[q] = i
+
+    # file des séparateurs: il suffit de mettre le plus petit des deux blocs
+    if len(blocs) == 2:
+        attente = [0 if len(blocs[0]) <= len(blocs[1]) else 1]
+    else:
+        attente = [0]
+    dans_attente = set(attente)
+
+    # Étape 2 : raffinement jusqu'à ce que la file soit vide
+    while attente:
+        tours += 1
+        s = attente.pop()
+        dans_attente.discard(s)
+        separateur = list(blocs[s])
+        for c in a.alphabet:
+            # états qui entrent dans le séparateur par c, regroupés par bloc
+            touches = {}
+            for q in separateur:
+                for p in pred[c][q]:
+                    touches.setdefault(bloc_de[p], []).append(p)
+            for i, entrants in touches.items():
+                e = blocs[i]
+                if len(entrants) == len(e):
+                    continue
+                # on coupe e: les entrants forment un nouveau bloc j
+                j = len(blocs)
+                e.difference_update(entrants)
+                blocs.append(set(entrants))
+                for p in entrants:
+                    bloc_de[p] = j
+                if i in dans_attente:
+                    attente.append(j)
+                    dans_attente.add(j)
+                else:
+                    # on ne traite que la plus petite moitié
+                    k = j if len(blocs[j]) <= len(e) else i
+                    attente.append(k)
+                    dans_attente.add(k)
+
+    # Étape 3 : on construit le nouvel automate minimal
+    # le bloc de l'état initial devient l'état 0
+    ordre = [bloc_de[0]] + [i for i in range(len(blocs)) if i != bloc_de[0]]
+    numero = [0] * len(blocs)
+    for k, i in enumerate(ordre):
+        numero[i] = k
+
+    res.n = len(blocs)
+    res.final = sorted({numero[bloc_de[q]] for q in a.final})
+    for i in ordre:
+        representant = next(iter(blocs[i]))
+        for c in a.alphabet:
+            q = a.transition[(representant, c)][0]
+            res.transition[(numero[i], c)] = [numero[bloc_de[q]]]
+    if stats is not None:
+        stats.ajoute("minimisation", debut, (a,), res, tours=tours)
     return res
 
-def tout_faire(a):
-    a1 = supression_epsilon_transitions(a)
-    a2 = determinisation(a1)
-    a3 = completion(a2)
-    a4 = minimisation(a3)
+
+def tout_faire(a, minimiseur=minimisation_hopcroft, stats=None):
+    """ chaîne suppression epsilon, déterminisation, complétion et minimisation
+        minimiseur permet de choisir l'algorithme de minimisation
+        (minimisation_hopcroft par défaut, minimisation pour Moore)
+        avec minimiseur=None on s'arrête à l'automate complet, ce qui suffit
+        pour egal_union_find
+        stats: objet Statistiques qui reçoit les mesures de chaque étape
+    """
+    a1 = supression_epsilon_transitions(a, stats)
+    a2 = determinisation(a1, stats)
+    a3 = completion(a2, stats)
+    if minimiseur is None:
+        return a3
+    a4 = minimiseur(a3, stats)
     return a4
 
 
-def egal(a1, a2):
+def egal(a1, a2, stats=None):
     """ retourne True si a1 et a2 reconnaissent le même langage
         On suppose a1 et a2 déterministes et complets (ou bien passer par tout_faire)
+        stats: mesure aussi le nombre de paires du produit visitées
     """
+    if stats is None:
+        return _egal(a1, a2, set())
+    debut = time.perf_counter()
+    visited = set()
+    res = _egal(a1, a2, visited)
+    stats.ajoute("egal", debut, (a1, a2), paires_visitees=len(visited), resultat=res)
+    return res
+
+
+def _egal(a1, a2, visited):
+    """ parcours du produit pour egal, visited reçoit les paires visitées """
     # s'assurer que même alphabet (on suppose ["a","b","c"])
     alpha = a1.alphabet
     # BFS sur le produit
     start = (0, 0)
-    visited = set([start])
+    visited.add(start)
     stack = [start]
     while stack:
         q1, q2 = stack.pop()
@@ -474,118 +1186,360 @@ def egal(a1, a2):
     return True
 
 
-# --- FONCTIONS POUR LE PDF ---
+def egal_union_find(a1, a2, stats=None):
+    """ retourne True si a1 et a2 reconnaissent le même langage
+        a1 et a2 déterministes et complets, pas forcément minimaux
+        (par exemple tout_faire(a, None)): algorithme de Hopcroft et Karp,
+        on fusionne les états qui doivent être équivalents dans un
+        union-find et on s'arrête au premier conflit final / non final
+        stats: mesure aussi le nombre de paires du produit visitées
+    """
+    # union-find sur les états de a1 (0..n1-1) et de a2 (n1..n1+n2-1)
+    parent = list(range(a1.n + a2.n))
+    if stats is None:
+        return _egal_union_find(a1, a2, parent)
+    debut = time.perf_counter()
+    res = _egal_union_find(a1, a2, parent)
+    # chaque paire visitée a fusionné deux classes: autant d'états qui ne
+    # sont plus représentants
+    fusions = sum(1 for q, p in enumerate(parent) if p != q)
+    stats.ajoute("egal_union_find", debut, (a1, a2), paires_visitees=fusions, resultat=res)
+    return res
 
-class PDFReport(FPDF):
-    def header(self):
-        self.set_font('Helvetica', 'B', 15)
-        self.cell(0, 10, 'Rapport de Projet: Automates', border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-        self.ln(10)
 
-    def chapter_title(self, title):
-        self.set_font('Helvetica', 'B', 12)
-        self.set_fill_color(200, 220, 255)
-        self.cell(0, 6, title, border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L', fill=True)
-        self.ln(4)
+def _egal_union_find(a1, a2, parent):
+    """ algorithme de Hopcroft et Karp pour egal_union_find """
+    alpha = a1.alphabet
+    decalage = a1.n
+    taille = [1] * (a1.n + a2.n)
+    finals1 = set(a1.final)
+    finals2 = set(a2.final)
 
-    def chapter_body(self, body):
-        self.set_font('Helvetica', '', 12)
-        self.multi_cell(0, 5, body)
-        self.ln()
+    def trouve(q):
+        while parent[q] != q:
+            # compression de chemin par division
+            parent[q] = parent[parent[q]]
+            q = parent[q]
+        return q
 
-    def add_image(self, img_path, w=100):
-        if img_path and os.path.exists(img_path):
-            self.image(img_path, w=w)
-            self.ln()
-        else:
-            self.set_text_color(255, 0, 0)
-            self.cell(0, 10, "Image introuvable (Erreur Graphviz)", border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            self.set_text_color(0, 0, 0)
+    def fusionne(r1, r2):
+        if taille[r1] < taille[r2]:
+            r1, r2 = r2, r1
+        parent[r2] = r1
+        taille[r1] += taille[r2]
+
+    if (0 in finals1) != (0 in finals2):
+        return False
+    fusionne(0, decalage)
+    pile = [(0, 0)]
+    while pile:
+        q1, q2 = pile.pop()
+        for c in alpha:
+            t1 = a1.transition.get((q1, c), [None])[0]
+            t2 = a2.transition.get((q2, c), [None])[0]
+            if t1 is None or t2 is None:
+                # automates non complets: passer par tout_faire avant
+                return False
+            r1 = trouve(t1)
+            r2 = trouve(t2 + decalage)
+            if r1 == r2:
+                continue
+            # t1 et t2 doivent être équivalents
+            if (t1 in finals1) != (t2 in finals2):
+                return False
+            fusionne(r1, r2)
+            pile.append((t1, t2))
+    return True
 
 
-def generer_rapport_pdf():
-    if not GRAPHVIZ_AVAILABLE:
-        print("Impossible de générer le PDF sans graphviz et fpdf")
-        return
+def egal_nfa(a1, a2, congruence=False):
+    """ retourne True si a1 et a2 reconnaissent le même langage
+        a1 et a2 sont des automates quelconques (par exemple ceux construits
+        par concatenation, union et etoile, avec epsilon transitions):
+        on parcourt à la volée le produit des deux déterminisations, en ne
+        calculant les fermetures epsilon que pour les états rencontrés,
+        et on s'arrête à la première paire en conflit
+        congruence=True active l'élagage par bisimulation à congruence près
+        (algorithme HKC de Bonchi et Pous)
+    """
+    # les deux automates sont vus comme un seul NFA: q de a2 -> q + n1
+    decalage = a1.n
+    alpha = [c for c in a1.alphabet if c != "E"]
+    alpha += [c for c in a2.alphabet if c != "E" and c not in alpha]
 
-    pdf = PDFReport()
-    pdf.add_page()
+    def transitions(q, c):
+        if q < decalage:
+            return a1.transition.get((q, c), [])
+        return [d + decalage for d in a2.transition.get((q - decalage, c), [])]
 
-    # Création des automates de test
-    a = automate("a")
-    b = automate("b")
-    
-    # 1. Concaténation
-    cat = concatenation(a, b)
-    cat_img = cat.to_graphviz("graph_concat")
-    
-    pdf.chapter_title("1. Test Concatenation (a.b)")
-    pdf.chapter_body(f"Automate résultant de a.b :\n{cat}")
-    pdf.add_image(cat_img)
+    masque_finals = 0
+    for q in a1.final:
+        masque_finals |= 1 << q
+    for q in a2.final:
+        masque_finals |= 1 << (q + decalage)
 
-    # 2. Union
-    uni = union(a, b)
-    uni_img = uni.to_graphviz("graph_union")
-    
-    pdf.chapter_title("2. Test Union (a+b)")
-    pdf.chapter_body(f"Automate résultant de a+b :\n{uni}")
-    pdf.add_image(uni_img)
+    # fermetures epsilon et successeurs par lettre, calculés à la demande
+    fermeture_etat = {}
 
-    # 3. Etoile
-    st = etoile(a)
-    st_img = st.to_graphviz("graph_star")
-    
-    pdf.chapter_title("3. Test Etoile (a*)")
-    pdf.chapter_body(f"Automate résultant de a* :\n{st}")
-    pdf.add_image(st_img)
+    def fermeture(q):
+        if q not in fermeture_etat:
+            bits = 1 << q
+            pile = [q]
+            while pile:
+                p = pile.pop()
+                for r in transitions(p, "E"):
+                    if not (bits >> r) & 1:
+                        bits |= 1 << r
+                        pile.append(r)
+            fermeture_etat[q] = bits
+        return fermeture_etat[q]
 
-    # 4. Suppression Epsilon
-    s = supression_epsilon_transitions(cat) # (a.b) sans epsilon
-    s_img = s.to_graphviz("graph_no_eps")
-    
-    pdf.chapter_title("4. Suppression Epsilon sur a.b")
-    pdf.chapter_body(f"Automate sans epsilon :\n{s}")
-    pdf.add_image(s_img)
+    succ_etat = {}
 
-    # 5. Test Egalité
-    pdf.add_page()
-    pdf.chapter_title("5. Test d'Egalite")
-    
-    A = tout_faire(concatenation(etoile(union(a, b)), automate("c")))   # (a+b)* . c
-    B = tout_faire(union(concatenation(etoile(a), automate("c")), concatenation(etoile(b), automate("c"))))  # a*.c + b*.c
-    
-    A_img = A.to_graphviz("graph_A")
-    B_img = B.to_graphviz("graph_B")
-    
-    resultat = egal(A, B)
-    
-    pdf.chapter_body("Comparaison de A = (a+b)*.c et B = a*.c + b*.c")
-    pdf.chapter_body("Automate A (minimisé) :")
-    pdf.add_image(A_img)
-    pdf.chapter_body("Automate B (minimisé) :")
-    pdf.add_image(B_img)
-    
-    result_text = "EGAL" if resultat else "NON EGAL"
-    if resultat:
-        pdf.set_text_color(0, 100, 0)
-    else:
-        pdf.set_text_color(150, 0, 0)
-    
-    pdf.set_font('Helvetica', 'B', 14)
-    pdf.cell(0, 10, f"RESULTAT: {result_text}", border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf.set_text_color(0, 0, 0)
-
-    # Sauvegarde
-    pdf.output("rapport_projet.pdf")
-    print("\n---------------------------------------------------------")
-    print("PDF généré avec succès : rapport_projet.pdf")
-    print("---------------------------------------------------------")
-    
-    # Nettoyage des fichiers temporaires (optionnel)
-    # for f in ["graph_concat.png", "graph_union.png", "graph_star.png", "graph_no_eps.png", "graph_A.png", "graph_B.png"]:
-    #    if os.path.exists(f): os.remove(f)
+    def successeurs(X, c):
+        res = 0
+        while X:
+            bit = X & -X
+            q = bit.bit_length() - 1
+            X ^= bit
+            if (q, c) not in succ_etat:
+                bits = 0
+                for d in transitions(q, c):
+                    bits |= fermeture(d)
+                succ_etat[(q, c)] = bits
+            res |= succ_etat[(q, c)]
+        return res
+
+    def accepte(X):
+        return (X & masque_finals) != 0
+
+    def clot(z, paires):
+        # plus petit ensemble contenant z et stable par les paires (u, v):
+        # si u est inclus dans z on ajoute v, et réciproquement
+        change = True
+        while change:
+            change = False
+            for u, v in paires:
+                if not u & ~z and v & ~z:
+                    z |= v
+                    change = True
+                elif not v & ~z and u & ~z:
+                    z |= u
+                    change = True
+        return z
+
+    depart = (fermeture(0), fermeture(decalage))
+    if accepte(depart[0]) != accepte(depart[1]):
+        return False
+    if congruence:
+        # HKC: on saute une paire déjà impliquée par R et les paires en attente
+        R = []
+        attente = deque([depart])
+        while attente:
+            X, Y = attente.popleft()
+            paires = R + list(attente)
+            if clot(X, paires) == clot(Y, paires):
+                continue
+            if accepte(X) != accepte(Y):
+                return False
+            for c in alpha:
+                attente.append((successeurs(X, c), successeurs(Y, c)))
+            R.append((X, Y))
+        return True
+    visites = {depart}
+    attente = deque([depart])
+    while attente:
+        X, Y = attente.popleft()
+        for c in alpha:
+            paire = (successeurs(X, c), successeurs(Y, c))
+            if paire in visites:
+                continue
+            if accepte(paire[0]) != accepte(paire[1]):
+                return False
+            visites.add(paire)
+            attente.append(paire)
+    return True
+
+
+def inclus(a1, a2):
+    """ retourne None si le langage de a1 est inclus dans celui de a2, sinon
+        un plus court mot reconnu par a1 et pas par a2 (chaîne de caractères) ;
+        ce mot peut être le mot vide "", faux comme None: tester le résultat
+        par "inclus(a1, a2) is None", jamais par "if inclus(a1, a2)"
+        a1 et a2 sont des automates sans epsilon transitions (ceux de
+        supression_epsilon_transitions ; sinon elles sont supprimées d'abord)
+        on parcourt en largeur les paires (état p de a1, ensemble S d'états
+        de a2 atteints par le même mot) sans déterminiser a1 ; une paire
+        (p, S) est inutile si une paire (p, S') avec S' inclus dans S a déjà
+        été vue (antichaîne): tout contre-exemple depuis (p, S) en est un
+        depuis (p, S')
+    """
+    for a in (a1, a2):
+        if any(c == "E" and dests for (q, c), dests in a.transition.items()):
+            if a is a1:
+                a1 = supression_epsilon_transitions(a1)
+            else:
+                a2 = supression_epsilon_transitions(a2)
+    alpha = [c for c in a1.alphabet if c != "E"]
+
+    # états de a1 depuis lesquels on peut atteindre un état final
+    pred = [[] for _ in range(a1.n)]
+    for (q, c), dests in a1.transition.items():
+        for d in dests:
+            pred[d].append(q)
+    utile = [False] * a1.n
+    pile = list(a1.final)
+    for q in pile:
+        utile[q] = True
+    while pile:
+        q = pile.pop()
+        for p in pred[q]:
+            if not utile[p]:
+                utile[p] = True
+                pile.append(p)
+
+    finals1 = set(a1.final)
+    masque_finals2 = 0
+    for q in a2.final:
+        masque_finals2 |= 1 << q
+
+    # successeurs par lettre des états de a2 (bitsets), calculés à la demande
+    succ_etat = {}
+
+    def successeurs(S, c):
+        res = 0
+        while S:
+            bit = S & -S
+            q = bit.bit_length() - 1
+            S ^= bit
+            if (q, c) not in succ_etat:
+                bits = 0
+                for d in a2.transition.get((q, c), []):
+                    bits |= 1 << d
+                succ_etat[(q, c)] = bits
+            res |= succ_etat[(q, c)]
+        return res
+
+    def mot(paire):
+        lettres = []
+        while origine[paire] is not None:
+            paire, c = origine[paire]
+            lettres.append(c)
+        lettres.reverse()
+        return "".join(lettres)
+
+    if not utile[0]:
+        return None
+    depart = (0, 1)
+    origine = {depart: None}
+    if 0 in finals1 and not 1 & masque_finals2:
+        return mot(depart)
+    # antichaîne: pour chaque état de a1, les ensembles minimaux déjà vus
+    minimaux = [set() for _ in range(a1.n)]
+    minimaux[0].add(1)
+    attente = deque([depart])
+    while attente:
+        # une paire remplacée entre temps par un ensemble plus petit (trouvé
+        # plus loin dans le parcours) est quand même explorée: le premier
+        # contre-exemple trouvé reste un plus court
+        p, S = attente.popleft()
+        for c in alpha:
+            T = successeurs(S, c)
+            for d in a1.transition.get((p, c), []):
+                if not utile[d] or any(not U & ~T for U in minimaux[d]):
+                    continue
+                paire = (d, T)
+                origine[paire] = ((p, S), c)
+                if d in finals1 and not T & masque_finals2:
+                    return mot(paire)
+                minimaux[d] = {U for U in minimaux[d] if T & ~U}
+                minimaux[d].add(T)
+                attente.append(paire)
+    return None
+
+
+def vide(a):
+    """ retourne True si a ne reconnaît aucun mot
+        pour un automate_paresseux (intersection, complement, difference),
+        les états sont découverts un à un et on s'arrête au premier état
+        final, sans construire le reste de l'automate
+    """
+    a = _paresseux(a)
+    symboles = [c for c in a.alphabet if c != "E"]
+    depart = a.depart()
+    vus = {depart}
+    pile = [depart]
+    while pile:
+        x = pile.pop()
+        if a.est_final(x):
+            return False
+        for c in symboles:
+            for y in a.successeurs(x, c):
+                if y not in vus:
+                    vus.add(y)
+                    pile.append(y)
+    return True
+
+
+def forme_canonique(a):
+    """ retourne l'automate déterministe a renuméroté par un parcours en
+        largeur depuis l'état 0, les symboles étant essayés dans un ordre
+        fixe (tri par repr) ; les états inaccessibles sont retirés
+        deux automates minimaux complets (tout_faire) reconnaissent le même
+        langage sur le même alphabet si et seulement si leurs formes
+        canoniques sont identiques
+    """
+    symboles = sorted((c for c in a.alphabet if c != "E"), key=repr)
+    numero = {0: 0}
+    ordre = [0]
+    i = 0
+    while i < len(ordre):
+        q = ordre[i]
+        for c in symboles:
+            dests = a.transition.get((q, c))
+            if dests and dests[0] not in numero:
+                numero[dests[0]] = len(ordre)
+                ordre.append(dests[0])
+        i += 1
+    res = automate(alphabet=symboles)
+    res.name = a.name
+    res.n = len(ordre)
+    res.final = sorted(numero[q] for q in a.final if q in numero)
+    for q in ordre:
+        for c in symboles:
+            dests = a.transition.get((q, c))
+            if dests:
+                res.transition[(numero[q], c)] = [numero[dests[0]]]
+    return res
+
+
+def empreinte(a):
+    """ empreinte (32 chiffres hexadécimaux) du langage de l'automate
+        minimal complet a (tout_faire): hachage de la sérialisation de sa
+        forme canonique, identique d'une exécution ou d'une machine à l'autre
+        deux expressions sont équivalentes si et seulement si les empreintes
+        de leurs automates minimaux sont égales (aux collisions près)
+    """
+    c = forme_canonique(a)
+    symboles = c.alphabet
+    k = len(symboles)
+    code = {s: i for i, s in enumerate(symboles)}
+    table = array("i", [-1]) * (c.n * k)
+    for (q, s), dests in c.transition.items():
+        table[q * k + code[s]] = dests[0]
+    finals = bytearray(c.n)
+    for q in c.final:
+        finals[q] = 1
+    if sys.byteorder != "little":
+        table.byteswap()
+    donnees = b"".join([struct.pack("<ii", c.n, k),
+                        "\0".join(repr(s) for s in symboles).encode("utf-8"), b"\0",
+                        bytes(finals), table.tobytes()])
+    return hashlib.blake2b(donnees, digest_size=16).hexdigest()
 
 
 if __name__ == "__main__":
+    # import local: le rendu (graphviz, fpdf) ne fait pas partie du noyau
+    from rendu import generer_rapport_pdf
     print("=== Exécution des tests et génération du PDF ===")
     generer_rapport_pdf()
@@ -0,0 +1,205 @@
+"""
+mesures de performance sur des familles d'expressions paramétrées
+
+pour chaque expression on chronomètre séparément chaque étape de tout_faire
+(construction de Thompson, suppression epsilon, déterminisation, complétion,
+minimisation), on relève le nombre d'états et de transitions et le pic
+mémoire ; pour les paires d'expressions on chronomètre egal et
+egal_union_find. Les résultats sont écrits en JSON pour comparer deux
+versions du code :
+    python3 benchmark.py --sortie avant.json
+    python3 benchmark.py --sortie apres.json --reference avant.json
+"""
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+
+from automate import (supression_epsilon_transitions, determinisation, completion,
+                      minimisation_hopcroft, egal, egal_union_find)
+from parseur import expression
+
+FORMAT = 1
+
+
+def etoiles_imbriquees(n):
+    """ ((...(a)*...)*)* avec n étoiles """
+    e = "a"
+    for _ in range(n):
+        e = "(" + e + ")*"
+    return e
+
+
+def unions_longues(n):
+    """ union de n mots de trois lettres """
+    lettres = "abc"
+    return "+".join(lettres[i % 3] + "." + lettres[(i // 3) % 3] + "." + lettres[(i // 9) % 3]
+                    for i in range(n))
+
+
+def exponentielle(n):
+    """ (a+b)*a(a+b)^n: le DFA minimal a 2^(n+1) états """
+    return "(a+b)*a" + "(a+b)" * n
+
+
+def aleatoire(n, graine=0):
+    """ expression aléatoire à n lettres (reproductible pour une graine donnée) """
+    hasard = random.Random(graine * 100003 + n)
+
+    def construit(n):
+        if n == 1:
+            e = hasard.choice("abc")
+        else:
+            g = hasard.randint(1, n - 1)
+            op = hasard.choice("+.")
+            e = "(" + construit(g) + op + construit(n - g) + ")"
+        if hasard.random() < 0.2:
+            # la grammaire n'accepte qu'une étoile par atome
+            e = e + "*" if not e.endswith("*") else "(" + e + ")*"
+        return e
+
+    return construit(n)
+
+
+FAMILLES = {
+    "etoiles": etoiles_imbriquees,
+    "unions": unions_longues,
+    "exponentielle": exponentielle,
+    "aleatoire": aleatoire,
+}
+
+TAILLES = {
+    "etoiles": [10, 50, 200],
+    "unions": [10, 100, 500],
+    "exponentielle": [4, 8, 12],
+    "aleatoire": [10, 50, 200],
+}
+
+
+def paires(e):
+    """ paire équivalente et paire non équivalente construites à partir de
+        l'expression e: (e, e+e) et (e, e.a)
+    """
+    return [("equivalentes", e, "(" + e + ")+(" + e + ")"),
+            ("differentes", e, "(" + e + ").a")]
+
+
+def _chrono(f, *args, repetitions=1):
+    """ (meilleur temps en secondes, résultat) sur plusieurs exécutions """
+    meilleur = None
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        res = f(*args)
+        duree = time.perf_counter() - debut
+        if meilleur is None or duree < meilleur:
+            meilleur = duree
+    return meilleur, res
+
+
+def _taille(a):
+    return {"etats": a.n, "transitions": sum(len(v) for v in a.transition.values())}
+
+
+def mesure_expression(texte, repetitions=1):
+    """ liste des mesures de chaque étape de tout_faire pour l'expression texte """
+    res = []
+    etapes = [
+        ("thompson", expression),
+        ("supression_epsilon", supression_epsilon_transitions),
+        ("determinisation", determinisation),
+        ("completion", completion),
+        ("minimisation", minimisation_hopcroft),
+    ]
+    x = texte
+    for nom, f in etapes:
+        duree, x = _chrono(f, x, repetitions=repetitions)
+        res.append(dict(etape=nom, temps=duree, **_taille(x)))
+    # pic mémoire de tout le pipeline, mesuré à part (tracemalloc ralentit)
+    tracemalloc.start()
+    x = texte
+    for _, f in etapes:
+        x = f(x)
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    res.append({"etape": "total", "temps": sum(m["temps"] for m in res),
+                "memoire_pic": pic, **_taille(x)})
+    return res
+
+
+def mesure_paire(texte1, texte2, repetitions=1):
+    """ mesures de egal (sur les DFA minimaux) et egal_union_find (sur les DFA complets) """
+    complets = []
+    minimaux = []
+    for t in (texte1, texte2):
+        a = completion(determinisation(supression_epsilon_transitions(expression(t))))
+        complets.append(a)
+        minimaux.append(minimisation_hopcroft(a))
+    duree, r = _chrono(egal, *minimaux, repetitions=repetitions)
+    duree_uf, r_uf = _chrono(egal_union_find, *complets, repetitions=repetitions)
+    return [{"etape": "egal", "temps": duree, "resultat": r},
+            {"etape": "egal_union_find", "temps": duree_uf, "resultat": r_uf}]
+
+
+def lance(familles=None, tailles=None, repetitions=3, graine=0):
+    """ exécute le benchmark et retourne le document de résultats """
+    resultats = []
+    for famille in familles or FAMILLES:
+        for n in (tailles or TAILLES[famille]):
+            if famille == "aleatoire":
+                texte = aleatoire(n, graine)
+            else:
+                texte = FAMILLES[famille](n)
+            for m in mesure_expression(texte, repetitions):
+                resultats.append(dict(famille=famille, taille=n, cas="expression", **m))
+            for cas, t1, t2 in paires(texte):
+                for m in mesure_paire(t1, t2, repetitions):
+                    resultats.append(dict(famille=famille, taille=n, cas=cas, **m))
+    return {
+        "format": FORMAT,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "graine": graine,
+        "repetitions": repetitions,
+        "resultats": resultats,
+    }
+
+
+def compare_resultats(reference, actuel):
+    """ lignes de comparaison des temps (actuel / reference) pour les mesures communes """
+    def clef(m):
+        return (m["famille"], m["taille"], m["cas"], m["etape"])
+    avant = {clef(m): m for m in reference["resultats"]}
+    lignes = []
+    for m in actuel["resultats"]:
+        r = avant.get(clef(m))
+        if r is None or not r["temps"]:
+            continue
+        lignes.append("%-14s %5d %-13s %-20s %10.5f s %10.5f s  x%.2f" % (
+            clef(m) + (r["temps"], m["temps"], m["temps"] / r["temps"])))
+    return lignes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark des automates")
+    parser.add_argument("--familles", nargs="*", choices=list(FAMILLES), default=None)
+    parser.add_argument("--tailles", nargs="*", type=int, default=None,
+                        help="tailles (sinon tailles par défaut de chaque famille)")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--sortie", default=None, help="fichier JSON des résultats")
+    parser.add_argument("--reference", default=None,
+                        help="fichier JSON d'une exécution précédente à comparer")
+    args = parser.parse_args()
+    doc = lance(args.familles, args.tailles, args.repetitions, args.graine)
+    if args.sortie:
+        with open(args.sortie, "w") as f:
+            json.dump(doc, f, indent=1)
+    else:
+        for m in doc["resultats"]:
+            print(json.dumps(m))
+    if args.reference:
+        with open(args.reference) as f:
+            reference = json.load(f)
+        print("\n".join(compare_resultats(reference, doc)))
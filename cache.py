@@ -0,0 +1,222 @@
+"""
+cache des automates minimaux des sous-expressions
+
+les sous-expressions sont d'abord mises sous forme normale (union,
+intersection et concaténation aplaties, termes de l'union et de
+l'intersection triés et sans doublons, E retiré des concaténations, étoiles
+imbriquées fusionnées, double complémentaire retiré), dont l'empreinte
+(hachage calculé des feuilles vers la racine) est la clef du cache: "b+a" et
+"a+(b+a)" partagent la même entrée
+"""
+import hashlib
+from collections import OrderedDict
+
+from automate import (automate, union, concatenation, etoile, intersection, difference,
+                      complement, tout_faire, egal_union_find)
+from parseur import analyse
+
+
+def _hache(donnees):
+    return hashlib.blake2b(donnees, digest_size=16).digest()
+
+
+def empreinte(t, empreintes):
+    """ empreinte (16 octets) du terme t d'une forme normale, empreintes
+        étant le dico retourné avec elle par forme_et_empreintes
+    """
+    if isinstance(t, str):
+        return _hache(t.encode("utf-8"))
+    return empreintes[id(t)]
+
+
+def _noeud(t, empreintes):
+    """ note l'empreinte du noeud t (son opérateur et celles de ses fils) et le retourne """
+    empreintes[id(t)] = _hache(t[0].encode("utf-8") +
+                               b"".join(empreinte(f, empreintes) for f in t[1:]))
+    return t
+
+
+def forme_et_empreintes(arbre):
+    """ retourne (forme normale de l'arbre, empreintes de ses noeuds)
+        la forme normale a des feuilles inchangées et des noeuds
+        ("+", t1, ..., tk), ("&", t1, ..., tk), (".", t1, ..., tk),
+        ("*", e), ("~", e) ou ("-", g, d) ; les termes de + et & sont triés
+        par empreinte, si bien que deux formes normales égales ont la même
+        empreinte, calculée en temps linéaire quelle que soit la profondeur
+        empreintes est indexé par id(noeud) et ne vaut que tant que la forme
+        existe: le lire par empreinte(t, empreintes)
+        parcours itératif
+    """
+    empreintes = {}
+    resultats = []
+    pile = [(arbre, None)]
+    while pile:
+        e, nb = pile.pop()
+        if isinstance(e, str):
+            resultats.append(e)
+            continue
+        op = e[0]
+        if nb is None:
+            if op in ("+", ".", "&"):
+                # les descendants de même opérateur sont aplatis d'emblée,
+                # sans construire de noeud intermédiaire
+                operandes = []
+                a_voir = [e]
+                while a_voir:
+                    f = a_voir.pop()
+                    if not isinstance(f, str) and f[0] == op:
+                        a_voir.extend(reversed(f[1:]))
+                    else:
+                        operandes.append(f)
+            else:
+                operandes = e[1:]
+            pile.append((e, len(operandes)))
+            for f in reversed(operandes):
+                pile.append((f, None))
+            continue
+        fils = resultats[-nb:]
+        del resultats[-nb:]
+        if op == "*":
+            f = fils[0]
+            if f == "E" or (not isinstance(f, str) and f[0] == "*"):
+                resultats.append(f)
+            else:
+                resultats.append(_noeud(("*", f), empreintes))
+        elif op == "~":
+            f = fils[0]
+            if not isinstance(f, str) and f[0] == "~":
+                resultats.append(f[1])
+            else:
+                resultats.append(_noeud(("~", f), empreintes))
+        elif op == "-":
+            resultats.append(_noeud(("-",) + tuple(fils), empreintes))
+        else:
+            termes = []
+            for f in fils:
+                if not isinstance(f, str) and f[0] == op:
+                    termes.extend(f[1:])
+                else:
+                    termes.append(f)
+            if op in ("+", "&"):
+                # sans doublons, triés par empreinte
+                par_empreinte = {empreinte(t, empreintes): t for t in termes}
+                termes = [par_empreinte[h] for h in sorted(par_empreinte)]
+            else:
+                termes = [t for t in termes if t != "E"] or ["E"]
+            if len(termes) == 1:
+                resultats.append(termes[0])
+            else:
+                resultats.append(_noeud((op,) + tuple(termes), empreintes))
+    return resultats.pop(), empreintes
+
+
+def forme_normale(arbre):
+    """ retourne la forme normale de l'arbre (voir forme_et_empreintes) """
+    return forme_et_empreintes(arbre)[0]
+
+
+class CacheAutomates:
+    """ cache LRU: empreinte de la forme normale d'une sous-expression ->
+        automate minimal
+        taille_max = nombre maximal d'entrées (None: pas de limite),
+        on évince l'entrée utilisée le moins récemment
+        les automates du cache sont partagés: ne pas les modifier
+    """
+
+    def __init__(self, taille_max=1024):
+        self.taille_max = taille_max
+        self.entrees = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entrees)
+
+    def get(self, clef):
+        """ automate minimal de clef, ou None """
+        a = self.entrees.get(clef)
+        if a is None:
+            self.echecs += 1
+            return None
+        self.entrees.move_to_end(clef)
+        self.succes += 1
+        return a
+
+    def ajoute(self, clef, a):
+        self.entrees[clef] = a
+        self.entrees.move_to_end(clef)
+        if self.taille_max is not None:
+            while len(self.entrees) > self.taille_max:
+                self.entrees.popitem(last=False)
+                self.evictions += 1
+
+    def vide(self):
+        """ vide le cache et remet les compteurs à zéro """
+        self.entrees.clear()
+        self.succes = self.echecs = self.evictions = 0
+
+    def statistiques(self):
+        return {"entrees": len(self.entrees), "succes": self.succes,
+                "echecs": self.echecs, "evictions": self.evictions}
+
+    def __str__(self):
+        return f"Cache {len(self.entrees)}/{self.taille_max} entrées, " \
+               f"{self.succes} succès, {self.echecs} échecs, {self.evictions} évictions"
+
+
+def compile_minimal(arbre, cache):
+    """ retourne l'automate minimal de l'arbre
+        chaque sous-expression est cherchée dans le cache avant d'être
+        construite à partir des automates minimaux de ses fils
+    """
+    arbre, empreintes = forme_et_empreintes(arbre)
+    resultats = []
+    pile = [(arbre, False)]
+    while pile:
+        e, vu = pile.pop()
+        h = empreinte(e, empreintes)
+        if not vu:
+            a = cache.get(h)
+            if a is not None:
+                resultats.append(a)
+                continue
+            if isinstance(e, str):
+                a = tout_faire(automate(e))
+                cache.ajoute(h, a)
+                resultats.append(a)
+                continue
+            pile.append((e, True))
+            for fils in reversed(e[1:]):
+                pile.append((fils, False))
+            continue
+        fils = resultats[-(len(e) - 1):]
+        del resultats[-(len(e) - 1):]
+        if e[0] == "*":
+            a = etoile(fils[0])
+        elif e[0] == "~":
+            a = complement(fils[0])
+        elif e[0] == "-":
+            a = difference(fils[0], fils[1])
+        else:
+            operateur = {"+": union, ".": concatenation, "&": intersection}[e[0]]
+            a = fils[0]
+            for f in fils[1:]:
+                a = operateur(a, f)
+        a = tout_faire(a)
+        cache.ajoute(h, a)
+        resultats.append(a)
+    return resultats.pop()
+
+
+def expression_minimale(texte, cache):
+    """ retourne l'automate minimal de l'expression régulière texte """
+    return compile_minimal(analyse(texte), cache)
+
+
+def compare(texte1, texte2, cache):
+    """ retourne True si les deux expressions reconnaissent le même langage,
+        en réutilisant les automates du cache
+    """
+    return egal_union_find(expression_minimale(texte1, cache),
+                           expression_minimale(texte2, cache))
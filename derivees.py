@@ -0,0 +1,245 @@
+"""
+construction directe de l'automate déterministe par dérivées de Brzozowski
+
+les états sont des termes normalisés (associativité, commutativité et
+idempotence de "+" et de "&", associativité de ".", simplifications par E
+et O), ce qui garantit un nombre fini de dérivées ; l'automate obtenu est
+complet et souvent proche du minimal
+l'intersection, la différence et le complémentaire se dérivent comme les
+autres opérateurs: (t1&t2)' = t1'&t2' et (~t)' = ~(t')
+
+les termes sont numérotés dans une table (Derivateur): chaque terme
+distinct a un seul numéro ; un noeud est "O" (langage vide), "E", une
+lettre, ou un tuple ("+", t1, ..., tk) ou ("&", t1, ..., tk) (numéros
+triés, sans doublon), (".", t1, ..., tk), ("*", t) ou ("~", t), où les ti
+sont des numéros de termes: hacher, comparer ou trier un terme ne dépend
+pas de sa profondeur
+"""
+from collections import deque
+
+from automate import automate
+from parseur import analyse, nom
+
+
+class Derivateur:
+    """ table des termes normalisés, calcul des dérivées et de la présence
+        du mot vide, avec mémoïsation (parcours itératifs)
+    """
+
+    def __init__(self):
+        self.noeuds = []
+        self._numeros = {}
+        self._vide = {}
+        self._derivees = {}
+        self.O = self.numero("O")
+        self.E = self.numero("E")
+        # terme de tous les mots
+        self.TOUS = self.numero(("~", self.O))
+
+    def numero(self, noeud):
+        """ numéro du terme de noeud noeud (créé s'il est nouveau) """
+        t = self._numeros.get(noeud)
+        if t is None:
+            t = self._numeros[noeud] = len(self.noeuds)
+            self.noeuds.append(noeud)
+        return t
+
+    def _operateur(self, t):
+        """ opérateur du terme t, None pour une feuille """
+        n = self.noeuds[t]
+        return None if isinstance(n, str) else n[0]
+
+    def plus(self, termes):
+        """ union normalisée des termes """
+        res = set()
+        for t in termes:
+            if self._operateur(t) == "+":
+                res.update(self.noeuds[t][1:])
+            elif t != self.O:
+                res.add(t)
+        if not res:
+            return self.O
+        if len(res) == 1:
+            return res.pop()
+        return self.numero(("+",) + tuple(sorted(res)))
+
+    def point(self, termes):
+        """ concaténation normalisée des termes """
+        res = []
+        for t in termes:
+            if t == self.O:
+                return self.O
+            if self._operateur(t) == ".":
+                res.extend(self.noeuds[t][1:])
+            elif t != self.E:
+                res.append(t)
+        if not res:
+            return self.E
+        if len(res) == 1:
+            return res[0]
+        return self.numero((".",) + tuple(res))
+
+    def etoile(self, t):
+        """ étoile normalisée du terme """
+        if t == self.O or t == self.E:
+            return self.E
+        if self._operateur(t) == "*":
+            return t
+        return self.numero(("*", t))
+
+    def et(self, termes):
+        """ intersection normalisée des termes """
+        res = set()
+        for t in termes:
+            if t == self.O:
+                return self.O
+            if self._operateur(t) == "&":
+                res.update(self.noeuds[t][1:])
+            else:
+                res.add(t)
+        # ~O (tous les mots) est neutre
+        if len(res) > 1:
+            res.discard(self.TOUS)
+        if len(res) == 1:
+            return res.pop()
+        return self.numero(("&",) + tuple(sorted(res)))
+
+    def non(self, t):
+        """ complémentaire normalisé du terme """
+        if self._operateur(t) == "~":
+            return self.noeuds[t][1]
+        return self.numero(("~", t))
+
+    def terme(self, arbre):
+        """ terme normalisé d'un arbre de parseur.analyse """
+        resultats = []
+        pile = [(arbre, False)]
+        while pile:
+            e, vu = pile.pop()
+            if isinstance(e, str):
+                resultats.append(self.numero(e))
+            elif not vu:
+                pile.append((e, True))
+                for fils in reversed(e[1:]):
+                    pile.append((fils, False))
+            elif e[0] == "*":
+                resultats.append(self.etoile(resultats.pop()))
+            elif e[0] == "~":
+                resultats.append(self.non(resultats.pop()))
+            else:
+                d = resultats.pop()
+                g = resultats.pop()
+                if e[0] == "+":
+                    resultats.append(self.plus([g, d]))
+                elif e[0] == ".":
+                    resultats.append(self.point([g, d]))
+                elif e[0] == "&":
+                    resultats.append(self.et([g, d]))
+                else:
+                    resultats.append(self.et([g, self.non(d)]))
+        return resultats.pop()
+
+    def contient_vide(self, t):
+        """ True si le mot vide appartient au langage de t """
+        pile = [t]
+        while pile:
+            u = pile[-1]
+            if u in self._vide:
+                pile.pop()
+                continue
+            n = self.noeuds[u]
+            if isinstance(n, str):
+                v = n == "E"
+            elif n[0] == "*":
+                v = True
+            else:
+                manquants = [f for f in n[1:] if f not in self._vide]
+                if manquants:
+                    pile.extend(manquants)
+                    continue
+                if n[0] == "~":
+                    v = not self._vide[n[1]]
+                elif n[0] == "+":
+                    v = any(self._vide[f] for f in n[1:])
+                else:
+                    v = all(self._vide[f] for f in n[1:])
+            pile.pop()
+            self._vide[u] = v
+        return self._vide[t]
+
+    def _prefixe(self, n):
+        """ facteurs de la concaténation n à dériver: jusqu'au premier qui ne
+            contient pas le mot vide (inclus)
+        """
+        for i, f in enumerate(n[1:], 1):
+            if not self.contient_vide(f):
+                return n[1:i + 1]
+        return n[1:]
+
+    def derivee(self, t, c):
+        """ dérivée de Brzozowski de t par la lettre c """
+        pile = [t]
+        while pile:
+            u = pile[-1]
+            if (u, c) in self._derivees:
+                pile.pop()
+                continue
+            n = self.noeuds[u]
+            if isinstance(n, str):
+                d = self.E if n == c else self.O
+            else:
+                fils = self._prefixe(n) if n[0] == "." else n[1:]
+                manquants = [f for f in fils if (f, c) not in self._derivees]
+                if manquants:
+                    pile.extend(manquants)
+                    continue
+                derivees = [self._derivees[(f, c)] for f in fils]
+                if n[0] == "*":
+                    d = self.point([derivees[0], u])
+                elif n[0] == "~":
+                    d = self.non(derivees[0])
+                elif n[0] == "+":
+                    d = self.plus(derivees)
+                elif n[0] == "&":
+                    d = self.et(derivees)
+                else:
+                    # (t1 . reste)' = t1'.reste + reste' si t1 contient le mot vide
+                    d = self.plus([self.point([f] + list(n[i + 2:]))
+                                   for i, f in enumerate(derivees)])
+            pile.pop()
+            self._derivees[(u, c)] = d
+        return self._derivees[(t, c)]
+
+
+def automate_derivees(arbre, alphabet="abc"):
+    """ retourne l'automate déterministe complet de l'arbre, dont les états
+        sont les dérivées successives de l'expression (état 0 = l'expression)
+    """
+    der = Derivateur()
+    depart = der.terme(arbre)
+    numero = {depart: 0}
+    termes = [depart]
+    res = automate()
+    res.name = nom(arbre)
+    res.alphabet = list(alphabet)
+    res.final = []
+    attente = deque([depart])
+    while attente:
+        t = attente.popleft()
+        q = numero[t]
+        if der.contient_vide(t):
+            res.final.append(q)
+        for c in alphabet:
+            d = der.derivee(t, c)
+            if d not in numero:
+                numero[d] = len(termes)
+                termes.append(d)
+                attente.append(d)
+            res.transition[(q, c)] = [numero[d]]
+    res.n = len(termes)
+    return res
+
+
+def expression_derivees(texte, alphabet="abc"):
+    """ retourne l'automate déterministe complet de l'expression texte """
+    return automate_derivees(analyse(texte, alphabet), alphabet)
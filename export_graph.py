@@ -1,14 +1,170 @@
-from automate import *
-
-def export_dot(a, name="automate.dot"):
-    with open(name,"w") as f:
-        f.write("digraph A {\nrankdir=LR;\n")
-        f.write("start [shape=point]; start -> 0;\n")
-        for q in range(a.n):
-            shape = "doublecircle" if q in a.final else "circle"
-            f.write(f"{q} [shape={shape}];\n")
-        for (q,c),dests in a.transition.items():
-            for d in dests:
-                lbl = "ε" if c=="E" else c
-                f.write(f"{q} -> {d} [label=\"{lbl}\"];\n")
-        f.write("}\n")
+"""
+export des automates en DOT, en JSON-lines ou en liste d'arêtes
+
+l'écriture se fait au fil de l'eau, par paquets de lignes ; les transitions
+d'un état vers un même état sont fusionnées en une seule arête dont
+l'étiquette liste les symboles. Au-delà de SEUIL états, export_dot écrit une
+vue résumée: les composantes fortement connexes ("scc"), ou seulement les k
+états de plus grand degré ("degre")
+    export_dot(a, "a.dot")
+    export_dot(a, "a.dot", resume="degre", k=50)
+    export_json(a, "a.jsonl")
+    export_aretes(a, "a.txt")
+"""
+import json
+
+from automate import composantes_fortement_connexes
+
+# nombre d'états au-delà duquel export_dot écrit une vue résumée
+SEUIL = 2000
+# nombre de lignes écrites d'un coup
+PAQUET = 4096
+
+
+def _ecrit(f, lignes):
+    """ écrit les lignes (itérable de chaînes) dans f par paquets """
+    paquet = []
+    for ligne in lignes:
+        paquet.append(ligne)
+        if len(paquet) >= PAQUET:
+            f.write("".join(paquet))
+            paquet.clear()
+    f.write("".join(paquet))
+
+
+def _symbole(c):
+    return "ε" if c == "E" else str(c)
+
+
+def _etiquette(symboles):
+    """ étiquette DOT (entre guillemets) d'une liste de symboles """
+    texte = ",".join(_symbole(c) for c in symboles)
+    return '"' + texte.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _sortants(a):
+    """ sortants[q] = liste des (symbole, destinations) de l'état q """
+    sortants = [[] for _ in range(a.n)]
+    for (q, c), dests in a.transition.items():
+        sortants[q].append((c, dests))
+    return sortants
+
+
+def aretes(a):
+    """ itère sur les arêtes fusionnées (q, d, symboles) de l'automate a,
+        état de départ par état de départ
+    """
+    for q, liste in enumerate(_sortants(a)):
+        vers = {}
+        for c, dests in liste:
+            for d in dests:
+                vers.setdefault(d, []).append(c)
+        for d, symboles in vers.items():
+            yield q, d, symboles
+
+
+def _lignes_dot(a, finals):
+    yield "digraph A {\nrankdir=LR;\n"
+    yield "start [shape=point]; start -> 0;\n"
+    for q in range(a.n):
+        shape = "doublecircle" if q in finals else "circle"
+        yield f"{q} [shape={shape}];\n"
+    for q, d, symboles in aretes(a):
+        yield f"{q} -> {d} [label={_etiquette(symboles)}];\n"
+    yield "}\n"
+
+
+def _lignes_scc(a, finals):
+    """ vue condensée: un noeud par composante fortement connexe, étiqueté
+        par son nombre d'états, et une arête par paire de composantes reliées
+    """
+    succ = [[] for _ in range(a.n)]
+    for (q, c), dests in a.transition.items():
+        succ[q].extend(dests)
+    comp, membres = composantes_fortement_connexes(succ)
+    nb = len(membres)
+    finale = [False] * nb
+    for q in finals:
+        finale[comp[q]] = True
+    yield f"digraph A {{\nrankdir=LR;\nlabel=\"{a.n} états, {nb} composantes\";\n"
+    yield f"start [shape=point]; start -> C{comp[0]};\n"
+    for i in range(nb):
+        shape = "doublecircle" if finale[i] else "circle"
+        yield f"C{i} [shape={shape}, label=\"{len(membres[i])}\"];\n"
+    symboles = {}
+    for (q, c), dests in a.transition.items():
+        for d in dests:
+            if comp[q] != comp[d]:
+                symboles.setdefault((comp[q], comp[d]), set()).add(c)
+    for (i, j), s in symboles.items():
+        yield f"C{i} -> C{j} [label={_etiquette(sorted(s, key=str))}];\n"
+    yield "}\n"
+
+
+def _lignes_degre(a, finals, k):
+    """ vue partielle: les k états de plus grand degré (et l'état initial),
+        avec les arêtes entre eux ; le label de chaque état donne son degré
+    """
+    degre = [0] * a.n
+    for (q, c), dests in a.transition.items():
+        degre[q] += len(dests)
+        for d in dests:
+            degre[d] += 1
+    garde = set(sorted(range(a.n), key=lambda q: -degre[q])[:k])
+    garde.add(0)
+    yield f"digraph A {{\nrankdir=LR;\nlabel=\"{len(garde)} états de plus grand degré sur {a.n}\";\n"
+    yield "start [shape=point]; start -> 0;\n"
+    for q in sorted(garde):
+        shape = "doublecircle" if q in finals else "circle"
+        yield f"{q} [shape={shape}, label=\"{q} ({degre[q]})\"];\n"
+    for q, d, symboles in aretes(a):
+        if q in garde and d in garde:
+            yield f"{q} -> {d} [label={_etiquette(symboles)}];\n"
+    yield "}\n"
+
+
+def export_dot(a, name="automate.dot", seuil=SEUIL, resume="scc", k=100):
+    """ écrit l'automate a au format DOT dans le fichier name ; au-delà de
+        seuil états (None: jamais), écrit la vue résumée resume ("scc" ou
+        "degre", les k états de plus grand degré)
+    """
+    finals = set(a.final)
+    if seuil is None or a.n <= seuil:
+        lignes = _lignes_dot(a, finals)
+    elif resume == "scc":
+        lignes = _lignes_scc(a, finals)
+    elif resume == "degre":
+        lignes = _lignes_degre(a, finals, k)
+    else:
+        raise ValueError("résumé inconnu: " + repr(resume))
+    with open(name, "w", encoding="utf-8") as f:
+        _ecrit(f, lignes)
+
+
+def _lignes_json(a):
+    yield json.dumps({"name": a.name, "n": a.n, "initial": 0,
+                      "alphabet": [str(c) for c in a.alphabet]}, ensure_ascii=False) + "\n"
+    for q in sorted(set(a.final)):
+        yield f'{{"final": {q}}}\n'
+    for q, d, symboles in aretes(a):
+        yield json.dumps({"de": q, "vers": d, "symboles": [str(c) for c in symboles]},
+                         ensure_ascii=False) + "\n"
+
+
+def export_json(a, name="automate.jsonl"):
+    """ écrit l'automate a en JSON-lines: une ligne d'en-tête (name, n,
+        initial, alphabet), une ligne {"final": q} par état final, puis une
+        ligne {"de": q, "vers": d, "symboles": [...]} par arête fusionnée
+        ("E" désigne epsilon)
+    """
+    with open(name, "w", encoding="utf-8") as f:
+        _ecrit(f, _lignes_json(a))
+
+
+def export_aretes(a, name="automate.txt"):
+    """ écrit la liste des arêtes fusionnées de a, une par ligne:
+        départ, arrivée et symboles séparés par des virgules (tabulations
+        entre les champs)
+    """
+    with open(name, "w", encoding="utf-8") as f:
+        _ecrit(f, (f"{q}\t{d}\t{','.join(map(str, symboles))}\n" for q, d, symboles in aretes(a)))
@@ -0,0 +1,194 @@
+"""
+comparaison d'un grand nombre de paires d'expressions sur plusieurs coeurs
+
+le fichier d'entrée contient les expressions deux par deux, une par ligne,
+comme test.1 (les lignes vides sont ignorées) ; on écrit une ligne
+EGAL / NON EGAL par paire, dans l'ordre de l'entrée :
+    python3 lot.py paires.txt -j 8
+    python3 lot.py < paires.txt
+
+avec --empreintes ou --groupes, le fichier contient une expression par
+ligne ; on écrit l'empreinte de son langage (voir automate.empreinte), ou
+les expressions regroupées par langage (une ligne par groupe)
+    python3 lot.py corpus.txt --groupes
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from automate import automate_compact, compacter, tout_faire, egal_union_find, empreinte
+from parseur import ErreurSyntaxe, compare, expression
+
+
+def _vers_transport(x):
+    """ expression (str) laissée telle quelle, automate sérialisé en octets
+        (les automates paresseux, résultats d'intersection, complement ou
+        difference, sont d'abord construits: compacter lit n, final et
+        transition)
+    """
+    if isinstance(x, str):
+        return x
+    if not isinstance(x, automate_compact):
+        x = compacter(x)
+    return x.vers_octets()
+
+
+def _depuis_transport(x):
+    if isinstance(x, str):
+        return expression(x)
+    return automate_compact.depuis_octets(x)
+
+
+def _erreur(e):
+    """ message d'une paire ou d'une expression en échec: le message
+        d'ErreurSyntaxe, ou le type et le message de toute autre exception
+    """
+    if isinstance(e, ErreurSyntaxe):
+        return str(e)
+    return f"Erreur {type(e).__name__}: {e}"
+
+
+def _traite_lot(lot):
+    """ exécuté dans un processus fils: résultat de chaque paire du lot
+        (True, False, ou le message d'erreur) ; une paire en échec ne
+        fait pas échouer le lot
+    """
+    res = []
+    for x1, x2 in lot:
+        try:
+            if isinstance(x1, str) and isinstance(x2, str):
+                # deux expressions: alphabet compressé en classes
+                res.append(compare(x1, x2))
+                continue
+            a1 = tout_faire(_depuis_transport(x1), None)
+            a2 = tout_faire(_depuis_transport(x2), None)
+            res.append(egal_union_find(a1, a2))
+        except Exception as e:
+            res.append(_erreur(e))
+    return res
+
+
+def _empreintes_lot(lot):
+    """ exécuté dans un processus fils: empreinte de chaque expression du lot
+        (ou le message d'erreur)
+    """
+    res = []
+    for x in lot:
+        try:
+            res.append(empreinte(tout_faire(_depuis_transport(x))))
+        except Exception as e:
+            res.append(_erreur(e))
+    return res
+
+
+def paires_depuis_lignes(lignes):
+    """ regroupe les lignes non vides deux par deux """
+    lignes = (l.strip() for l in lignes)
+    lignes = (l for l in lignes if l)
+    for l1 in lignes:
+        l2 = next(lignes, None)
+        if l2 is None:
+            raise ValueError("nombre impair d'expressions: " + l1)
+        yield (l1, l2)
+
+
+def egalites(paires, processus=None, taille_lot=256):
+    """ générateur des résultats de egal pour chaque paire, dans l'ordre
+        une paire contient deux expressions (str) ou deux automates
+        le résultat est True / False, ou le message d'erreur de la paire
+        les paires sont envoyées par lots de taille_lot à processus
+        processus fils (nombre de coeurs par défaut), avec au plus deux lots
+        en attente par processus
+    """
+    lots = ([(_vers_transport(x1), _vers_transport(x2)) for x1, x2 in lot]
+            for lot in _lots(paires, taille_lot))
+    return _en_parallele(_traite_lot, lots, processus)
+
+
+def empreintes(expressions, processus=None, taille_lot=256):
+    """ générateur des empreintes du langage de chaque expression (str) ou
+        automate, dans l'ordre (ou le message d'erreur)
+        réparties sur plusieurs processus comme egalites
+    """
+    lots = ([_vers_transport(x) for x in lot] for lot in _lots(expressions, taille_lot))
+    return _en_parallele(_empreintes_lot, lots, processus)
+
+
+def groupes(expressions, processus=None, taille_lot=256):
+    """ regroupe les expressions par langage: dictionnaire empreinte ->
+        liste des expressions de même langage, dans l'ordre de l'entrée
+        (un seul calcul d'automate par expression, aucune comparaison deux
+        à deux) ; les expressions invalides sont sous la clef None
+    """
+    expressions = list(expressions)
+    res = {}
+    for x, e in zip(expressions, empreintes(expressions, processus, taille_lot)):
+        if e.startswith("Erreur"):
+            e = None
+        res.setdefault(e, []).append(x)
+    return res
+
+
+def _lots(elements, taille_lot):
+    elements = iter(elements)
+    while True:
+        lot = list(islice(elements, taille_lot))
+        if not lot:
+            return
+        yield lot
+
+
+def _en_parallele(traite_lot, lots, processus=None):
+    """ générateur des résultats de traite_lot sur chaque lot, dans l'ordre,
+        avec processus processus fils (nombre de coeurs par défaut) et au plus
+        deux lots en attente par processus
+    """
+    processus = processus or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processus) as executeur:
+        en_cours = deque()
+        max_en_cours = 2 * processus
+        while True:
+            while len(en_cours) < max_en_cours:
+                lot = next(lots, None)
+                if lot is None:
+                    break
+                en_cours.append(executeur.submit(traite_lot, lot))
+            if not en_cours:
+                return
+            yield from en_cours.popleft().result()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="égalité de paires d'expressions régulières")
+    parser.add_argument("fichier", nargs="?", help="fichier de paires (entrée standard par défaut)")
+    parser.add_argument("-j", "--processus", type=int, default=None,
+                        help="nombre de processus (nombre de coeurs par défaut)")
+    parser.add_argument("--taille-lot", type=int, default=256,
+                        help="nombre de paires envoyées à la fois à un processus")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--empreintes", action="store_true",
+                      help="une expression par ligne: écrit empreinte et expression")
+    mode.add_argument("--groupes", action="store_true",
+                      help="une expression par ligne: écrit les expressions de même langage")
+    args = parser.parse_args()
+    source = open(args.fichier) if args.fichier else sys.stdin
+    sortie = sys.stdout
+    if args.empreintes or args.groupes:
+        expressions = [l.strip() for l in source if l.strip()]
+        if args.empreintes:
+            for x, e in zip(expressions, empreintes(expressions, args.processus, args.taille_lot)):
+                sortie.write(e + "\t" + x + "\n")
+        else:
+            for e, membres in groupes(expressions, args.processus, args.taille_lot).items():
+                sortie.write(("ERREUR" if e is None else e) + "\t" + "\t".join(membres) + "\n")
+        sys.exit(0)
+    for r in egalites(paires_depuis_lignes(source), args.processus, args.taille_lot):
+        if r is True:
+            sortie.write("EGAL\n")
+        elif r is False:
+            sortie.write("NON EGAL\n")
+        else:
+            sortie.write("ERREUR " + r + "\n")
@@ -0,0 +1,423 @@
+"""
+analyse des expressions régulières en Python, sans passer par flex/bison
+
+même grammaire et mêmes priorités que regexp.l / regexp.y :
+    expr    : expr "+" produit | expr produit | produit
+    produit : produit "&" concat | produit "-" concat | concat
+    concat  : concat "." term | term
+    term    : "~" term | atom "*" | atom
+    atom    : lettre | "E" | "(" expr ")"
+(la concaténation implicite se place donc au niveau de "+" :
+ "a+b c" se lit (a+b).c, comme avec le parseur bison)
+"&" est l'intersection, "-" la différence et "~" le complémentaire (parmi
+les mots sur l'alphabet)
+
+un arbre est soit une feuille (une lettre ou "E"), soit un tuple
+("+", g, d), (".", g, d), ("*", e), ("&", g, d), ("-", g, d) ou ("~", e)
+"""
+import sys
+
+from automate import (automate, Alphabet, representants, determinisation, completion,
+                      tout_faire, egal_union_find, _bits_vers_liste, SEUIL_BITS, union, concatenation,
+                      etoile, intersection, difference, complement)
+
+# opérateurs construits par produit d'automates (voir automate_paresseux)
+PRODUITS = ("&", "-", "~")
+
+
+class ErreurSyntaxe(ValueError):
+    """ erreur de syntaxe dans une expression, position = indice du caractère fautif """
+
+    def __init__(self, message, position):
+        super().__init__(f"Erreur syntaxe: {message} (position {position})")
+        self.position = position
+
+
+def lexemes(texte, alphabet="abc"):
+    """ découpe texte en liste de (lexème, position), terminée par ("FIN", len(texte)) """
+    res = []
+    for i, c in enumerate(texte):
+        if c in " \t\r\n":
+            continue
+        if c in "()+*.E&-~" or c in alphabet:
+            res.append((c, i))
+        else:
+            raise ErreurSyntaxe(f"caractère invalide {c!r}", i)
+    res.append(("FIN", len(texte)))
+    return res
+
+
+# priorité des opérateurs binaires, tous associatifs à gauche (la
+# concaténation implicite a la priorité de "+")
+PRIORITES = {"+": 1, "&": 2, "-": 2, ".": 3}
+
+
+class _Analyseur:
+    """ analyse par précédence d'opérateurs d'une liste de lexèmes, avec des
+        piles explicites: pas de limite de profondeur des parenthèses
+    """
+
+    def __init__(self, texte, alphabet):
+        self.alphabet = alphabet
+        self.lex = lexemes(texte, alphabet)
+        self.i = 0
+        self.valeurs = []   # sous-arbres terminés
+        self.ops = []       # (opérateur, priorité), "(" ou "~" en attente
+        self.ouvertes = 0   # nombre de "(" dans ops
+
+    def courant(self):
+        return self.lex[self.i][0]
+
+    def erreur(self, message):
+        raise ErreurSyntaxe(message, self.lex[self.i][1])
+
+    def debut_atome(self):
+        c = self.courant()
+        return c == "(" or c == "E" or c == "~" or c in self.alphabet
+
+    def reduit(self, priorite):
+        """ applique les opérateurs binaires en attente de priorité >= priorite """
+        ops = self.ops
+        valeurs = self.valeurs
+        while ops and isinstance(ops[-1], tuple) and ops[-1][1] >= priorite:
+            op = ops.pop()[0]
+            d = valeurs.pop()
+            valeurs[-1] = (op, valeurs[-1], d)
+
+    def terme(self, e):
+        """ e est un atome: lui applique l'étoile qui suit puis les "~" en attente """
+        if self.courant() == "*":
+            self.i += 1
+            e = ("*", e)
+        while self.ops and self.ops[-1] == "~":
+            self.ops.pop()
+            e = ("~", e)
+        self.valeurs.append(e)
+
+    def expr(self):
+        """ analyse tous les lexèmes et retourne l'arbre """
+        operande = True
+        while True:
+            c = self.courant()
+            if operande:
+                if c == "(" or c == "~":
+                    self.ops.append(c)
+                    self.ouvertes += c == "("
+                    self.i += 1
+                elif c == "E" or c in self.alphabet:
+                    self.i += 1
+                    self.terme(c)
+                    operande = False
+                elif c == "FIN":
+                    self.erreur("fin d'expression inattendue")
+                else:
+                    self.erreur(f"{c!r} inattendu")
+            elif c in PRIORITES:
+                self.reduit(PRIORITES[c])
+                self.ops.append((c, PRIORITES[c]))
+                self.i += 1
+                operande = True
+            elif self.debut_atome():
+                # concaténation implicite
+                self.reduit(PRIORITES["+"])
+                self.ops.append((".", PRIORITES["+"]))
+                operande = True
+            else:
+                self.reduit(0)
+                if self.ouvertes == 0:
+                    if c == "FIN":
+                        return self.valeurs.pop()
+                    self.erreur(f"{c!r} inattendu")
+                if c != ")":
+                    self.erreur("')' attendue")
+                self.ops.pop()
+                self.ouvertes -= 1
+                self.i += 1
+                self.terme(self.valeurs.pop())
+
+
+def analyse(texte, alphabet="abc"):
+    """ retourne l'arbre de l'expression régulière texte
+        lève ErreurSyntaxe avec la position de l'erreur
+    """
+    return _Analyseur(texte, alphabet).expr()
+
+
+def compile_arbre(arbre, alphabet="abc"):
+    """ retourne l'automate de l'arbre
+        les sous-arbres sans intersection, différence ni complémentaire sont
+        compilés par _compile_thompson ; les opérateurs &, - et ~ sont
+        appliqués à leurs automates par intersection, difference et
+        complement (produits construits à la demande), puis recollés par
+        union, concatenation et etoile
+    """
+    OPERATEURS = {"+": union, ".": concatenation, "&": intersection, "-": difference}
+    # pour chaque sous-arbre terminé: (arbre, automate ou None s'il ne
+    # contient aucun produit et n'a pas encore été compilé)
+    resultats = []
+    pile = [(arbre, False)]
+    while pile:
+        e, vu = pile.pop()
+        if isinstance(e, str):
+            resultats.append((e, None))
+        elif not vu:
+            pile.append((e, True))
+            for fils in reversed(e[1:]):
+                pile.append((fils, False))
+        else:
+            fils = resultats[-(len(e) - 1):]
+            del resultats[-(len(e) - 1):]
+            if e[0] not in PRODUITS and all(a is None for _, a in fils):
+                resultats.append((e, None))
+                continue
+            fils = [a if a is not None else _compile_thompson(f, alphabet) for f, a in fils]
+            if e[0] == "*":
+                a = etoile(fils[0])
+            elif e[0] == "~":
+                a = complement(fils[0], alphabet)
+            else:
+                a = OPERATEURS[e[0]](fils[0], fils[1])
+            resultats.append((e, a))
+    e, a = resultats.pop()
+    if a is None:
+        return _compile_thompson(e, alphabet)
+    a.name = nom(arbre)
+    return a
+
+
+def _compile_thompson(arbre, alphabet="abc"):
+    """ retourne l'automate de Thompson de l'arbre, le même que celui construit
+        par automate, union, concatenation et etoile, mais en une seule
+        numérotation des états: chaque sous-automate occupe un intervalle
+        d'états consécutifs, alloués dans l'ordre de lecture, et on n'ajoute
+        que les epsilon transitions de recollement (aucune copie)
+        (parcours itératif: pas de limite de profondeur de récursion)
+    """
+    res = automate(alphabet=alphabet)
+    res.name = nom(arbre)
+    transition = res.transition
+    compteur = 0
+    # pour chaque sous-arbre terminé: (état initial, état final)
+    resultats = []
+    pile = [(arbre, None)]
+    while pile:
+        e, debut = pile.pop()
+        if isinstance(e, str):
+            if e == "E":
+                resultats.append((compteur, compteur))
+                compteur += 1
+            else:
+                transition[(compteur, e)] = [compteur + 1]
+                resultats.append((compteur, compteur + 1))
+                compteur += 2
+        elif debut is None:
+            if e[0] == ".":
+                debut = -1
+            else:
+                # nouvel état initial pour l'union et l'étoile
+                debut = compteur
+                compteur += 1
+            pile.append((e, debut))
+            for fils in reversed(e[1:]):
+                pile.append((fils, None))
+        elif e[0] == ".":
+            debut_d, fin_d = resultats.pop()
+            debut_g, fin_g = resultats.pop()
+            res.ajoute_transition(fin_g, "E", [debut_d])
+            resultats.append((debut_g, fin_d))
+        elif e[0] == "+":
+            debut_d, fin_d = resultats.pop()
+            debut_g, fin_g = resultats.pop()
+            fin = compteur
+            compteur += 1
+            res.ajoute_transition(debut, "E", [debut_g, debut_d])
+            res.ajoute_transition(fin_g, "E", [fin])
+            res.ajoute_transition(fin_d, "E", [fin])
+            resultats.append((debut, fin))
+        else:
+            debut_e, fin_e = resultats.pop()
+            fin = compteur
+            compteur += 1
+            res.ajoute_transition(debut, "E", [debut_e, fin])
+            res.ajoute_transition(fin_e, "E", [debut_e, fin])
+            resultats.append((debut, fin))
+    res.n = compteur
+    res.final = [resultats.pop()[1]]
+    return res
+
+
+def nom(arbre):
+    """ nom de l'automate de l'arbre, écrit comme par les constructions de Thompson """
+    morceaux = []
+    # les morceaux de texte à écrire tels quels sont empilés dans des listes
+    pile = [arbre]
+    while pile:
+        e = pile.pop()
+        if isinstance(e, list):
+            morceaux.append(e[0])
+        elif isinstance(e, str):
+            morceaux.append("(" + e + ")")
+        elif e[0] == "*":
+            pile.extend([[")*"], e[1], ["("]])
+        elif e[0] == "~":
+            pile.extend([[")"], e[1], ["~("]])
+        else:
+            pile.extend([[")"], e[2], [e[0]], e[1], ["("]])
+    return "".join(morceaux)
+
+
+def _fusion(x, y):
+    """ union de deux set qui ne servent plus ailleurs: le plus petit est
+        versé dans le plus grand, qui est retourné
+    """
+    if len(x) < len(y):
+        x, y = y, x
+    x |= y
+    return x
+
+
+def glushkov(arbre, alphabet="abc"):
+    """ retourne l'automate des positions (Glushkov) de l'arbre: sans
+        epsilon transitions, un état par occurrence de lettre (numérotées
+        de 1 à m de gauche à droite) plus l'état initial 0
+        calculé par les ensembles first / last / follow, codés en entiers
+        (bit p à 1) jusqu'à SEUIL_BITS positions, comme dans determinisation ;
+        au-delà, un entier occuperait la place de sa plus grande position:
+        les ensembles sont des set, fusionnés du plus petit vers le plus grand
+    """
+    m = 0
+    pile = [arbre]
+    while pile:
+        e = pile.pop()
+        if isinstance(e, str):
+            m += e != "E"
+        else:
+            pile.extend(e[1:])
+    if m <= SEUIL_BITS:
+        nouveau, singleton, union, liste = int, lambda p: 1 << p, int.__or__, _bits_vers_liste
+    else:
+        nouveau, singleton, union, liste = set, lambda p: {p}, _fusion, sorted
+    lettre = [None]       # lettre[p] = lettre de la position p
+    follow = [nouveau()]  # follow[p] = positions qui peuvent suivre p
+    # pour chaque sous-arbre: (peut être vide, first, last)
+    resultats = []
+    pile = [(arbre, False)]
+    while pile:
+        e, vu = pile.pop()
+        if isinstance(e, str):
+            if e == "E":
+                resultats.append((True, nouveau(), nouveau()))
+            else:
+                p = len(lettre)
+                lettre.append(e)
+                follow.append(nouveau())
+                resultats.append((False, singleton(p), singleton(p)))
+        elif e[0] in PRODUITS:
+            raise ValueError("la construction de Glushkov ne traite pas " + e[0])
+        elif not vu:
+            pile.append((e, True))
+            for fils in reversed(e[1:]):
+                pile.append((fils, False))
+        elif e[0] == "*":
+            vide, first, last = resultats.pop()
+            for p in liste(last):
+                follow[p] |= first
+            resultats.append((True, first, last))
+        else:
+            vide2, first2, last2 = resultats.pop()
+            vide1, first1, last1 = resultats.pop()
+            if e[0] == "+":
+                resultats.append((vide1 or vide2, union(first1, first2), union(last1, last2)))
+            else:
+                for p in liste(last1):
+                    follow[p] |= first2
+                resultats.append((vide1 and vide2,
+                                  union(first1, first2) if vide1 else first1,
+                                  union(last1, last2) if vide2 else last2))
+    vide, first, last = resultats.pop()
+    res = automate()
+    res.name = nom(arbre)
+    res.alphabet = list(alphabet)
+    res.n = len(lettre)
+    res.final = liste(last) + ([0] if vide else [])
+    res.final.sort()
+    follow[0] = first
+    for p in range(res.n):
+        for q in liste(follow[p]):
+            res.ajoute_transition(p, lettre[q], [q])
+    return res
+
+
+def lettres(arbre):
+    """ ensemble des lettres qui apparaissent dans l'arbre """
+    res = set()
+    pile = [arbre]
+    while pile:
+        e = pile.pop()
+        if isinstance(e, str):
+            if e != "E":
+                res.add(e)
+        else:
+            pile.extend(e[1:])
+    return res
+
+
+def expression(texte, alphabet="abc"):
+    """ retourne l'automate de Thompson de l'expression régulière texte """
+    return compile_arbre(analyse(texte, alphabet), alphabet)
+
+
+def automate_complet_arbre(arbre, construction="thompson", alphabet="abc"):
+    """ retourne l'automate déterministe complet de l'arbre sur l'alphabet
+        construction = "thompson" (tout_faire sans minimisation)
+        ou "glushkov" (automate des positions, déjà sans epsilon transitions,
+        passé directement à determinisation)
+        ou "derivees" (dérivées de Brzozowski, automate déterministe complet
+        construit directement, voir derivees.py)
+        les opérateurs &, - et ~ sont traités par "thompson" et "derivees"
+    """
+    if construction == "thompson":
+        return tout_faire(compile_arbre(arbre, alphabet), None)
+    if construction == "glushkov":
+        return completion(determinisation(glushkov(arbre, alphabet)))
+    if construction == "derivees":
+        # import local: derivees importe parseur
+        from derivees import automate_derivees
+        return automate_derivees(arbre, alphabet)
+    raise ValueError("construction inconnue: " + str(construction))
+
+
+def automate_complet(texte, construction="thompson", alphabet="abc"):
+    """ retourne l'automate déterministe complet de l'expression texte """
+    return automate_complet_arbre(analyse(texte, alphabet), construction, alphabet)
+
+
+def compare(texte1, texte2, construction="thompson", alphabet="abc"):
+    """ retourne True si les deux expressions reconnaissent le même langage
+        sur alphabet; les symboles qui n'apparaissent dans aucune des deux
+        expressions forment une seule classe, et les automates sont
+        construits sur un représentant par classe
+    """
+    alphabet = Alphabet(alphabet)
+    arbre1 = analyse(texte1, alphabet)
+    arbre2 = analyse(texte2, alphabet)
+    classes = alphabet.classes(lettres(arbre1) | lettres(arbre2))
+    reduit = representants(classes)
+    a1 = automate_complet_arbre(arbre1, construction, reduit)
+    a2 = automate_complet_arbre(arbre2, construction, reduit)
+    return egal_union_find(a1, a2)
+
+
+if __name__ == "__main__":
+    # même usage que ./regexp < test.1 puis python3 main.py
+    source = open(sys.argv[1]) if len(sys.argv) > 1 else sys.stdin
+    lignes = [l.rstrip("\n") for l in source if l.strip()]
+    if len(lignes) < 2:
+        print("Erreur: deux expressions attendues", file=sys.stderr)
+        sys.exit(1)
+    try:
+        resultat = compare(lignes[0], lignes[1])
+    except ErreurSyntaxe as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    print("EGAL" if resultat else "NON EGAL")
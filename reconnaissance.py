@@ -0,0 +1,130 @@
+"""
+exécution d'un automate déterministe sur des mots
+
+compile(a) transforme l'automate (par exemple le résultat de tout_faire)
+en table de transitions plate et bitmap des états acceptants ; les symboles
+doivent être des caractères de code < 256 (un octet chacun)
+
+    m = compile(tout_faire(expression("(a+b)*.c")))
+    m.accepte("abbac")            # True
+    m.fullmatch(b"abbac")         # True
+    for ligne in m.lignes_acceptees("mots.txt"): ...
+"""
+
+
+class automate_compile:
+    """
+    automate déterministe prêt à être exécuté:
+    - classes: table de 256 octets, classes[o] = colonne du symbole d'octet o
+      (dernière colonne: symbole hors alphabet)
+    - table: liste plate, l'état q est représenté par q*largeur (indice du début
+      de sa ligne), table[q*largeur + colonne] = état d'arrivée (déjà multiplié)
+    - acceptant: bytearray, acceptant[q] = 1 si l'état de ligne q est final
+    tous les états qui ne mènent à aucun état final sont fusionnés en un état
+    mort, sur lequel la lecture s'arrête
+    """
+    __slots__ = ("name", "n", "largeur", "classes", "table", "acceptant", "mort", "depart")
+
+    def __init__(self, a):
+        colonnes = []
+        for c in a.alphabet:
+            o = ord(c)
+            if not 0 <= o < 256:
+                raise ValueError("symbole hors des octets: " + repr(c))
+            colonnes.append(o)
+        k = len(colonnes)
+        if k > 255:
+            raise ValueError("au plus 255 symboles")
+        self.largeur = k + 1
+        classes = bytearray([k]) * 256
+        for s, o in enumerate(colonnes):
+            classes[o] = s
+        self.classes = bytes(classes)
+
+        # états utiles: ceux qui peuvent atteindre un état final
+        pred = [[] for _ in range(a.n)]
+        for (q, c), dests in a.transition.items():
+            for d in dests:
+                pred[d].append(q)
+        utile = bytearray(a.n)
+        pile = list(a.final)
+        for q in pile:
+            utile[q] = 1
+        while pile:
+            q = pile.pop()
+            for p in pred[q]:
+                if not utile[p]:
+                    utile[p] = 1
+                    pile.append(p)
+        # numérotation: états utiles puis l'état mort
+        numero = [-1] * a.n
+        nb = 0
+        for q in range(a.n):
+            if utile[q]:
+                numero[q] = nb
+                nb += 1
+        self.n = nb + 1
+        mort = nb * self.largeur
+        self.mort = mort
+        table = [mort] * (self.n * self.largeur)
+        acceptant = bytearray(self.n)
+        finals = set(a.final)
+        for q in range(a.n):
+            if numero[q] == -1:
+                continue
+            ligne = numero[q] * self.largeur
+            acceptant[numero[q]] = q in finals
+            for s, c in enumerate(a.alphabet):
+                dests = a.transition.get((q, c))
+                if dests and numero[dests[0]] != -1:
+                    table[ligne + s] = numero[dests[0]] * self.largeur
+        self.table = table
+        self.acceptant = acceptant
+        self.name = a.name
+        # état initial: 0 s'il est utile, sinon l'automate ne reconnaît rien
+        self.depart = 0 if numero[0] == 0 else mort
+
+    def fullmatch(self, donnees):
+        """ True si la suite d'octets donnees (bytes, bytearray, memoryview)
+            est reconnue en entier
+        """
+        if not isinstance(donnees, (bytes, bytearray)):
+            donnees = bytes(donnees)
+        table = self.table
+        mort = self.mort
+        q = self.depart
+        if q == mort:
+            return False
+        # traduction des octets en colonnes en une seule passe (en C)
+        for c in donnees.translate(self.classes):
+            q = table[q + c]
+            if q == mort:
+                return False
+        return self.acceptant[q // self.largeur] == 1
+
+    def accepte(self, mot):
+        """ True si le mot (chaîne de caractères ou suite d'octets) est reconnu """
+        if isinstance(mot, str):
+            try:
+                mot = mot.encode("latin-1")
+            except UnicodeEncodeError:
+                return False
+        return self.fullmatch(mot)
+
+    def lignes_acceptees(self, fichier):
+        """ itère sur les lignes reconnues (bytes, sans fin de ligne) d'un
+            fichier binaire ouvert ou d'un chemin
+        """
+        if isinstance(fichier, (str, bytes)) or hasattr(fichier, "__fspath__"):
+            with open(fichier, "rb") as f:
+                yield from self.lignes_acceptees(f)
+            return
+        for ligne in fichier:
+            ligne = ligne.rstrip(b"\r\n")
+            if self.fullmatch(ligne):
+                yield ligne
+
+
+def compile(a):
+    """ retourne l'automate_compile de l'automate déterministe a """
+    return automate_compile(a)
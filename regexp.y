@@ -11,6 +11,10 @@ int nb_lignes = 0;
 
 FILE *out;
 
+/* pile d'analyse de bison: 10000 par défaut, trop peu pour les expressions
+   très imbriquées */
+#define YYMAXDEPTH 1000000
+
 char *new_var() {
     char *s = malloc(16);
     sprintf(s, "a%d", cpt++);
@@ -22,11 +26,13 @@ char *new_var() {
 
 %token <str> CHAR
 %token EPS
-%token PAR_O PAR_F PLUS STAR DOT
-%type <str> expr concat term atom
+%token PAR_O PAR_F PLUS STAR DOT AND MINUS NOT
+%type <str> expr produit concat term atom
 
 %left PLUS
+%left AND MINUS
 %left DOT
+%right NOT
 %right STAR
 
 %%
@@ -45,12 +51,12 @@ ligne:
         nb_lignes++;
 
         if (nb_lignes == 1) {
-            fprintf(out, "res1 = tout_faire(%s)\n\n", $1);
+            fprintf(out, "res1 = tout_faire(compile_arbre(%s), None)\n\n", $1);
         }
         else if (nb_lignes == 2) {
-            fprintf(out, "res2 = tout_faire(%s)\n\n", $1);
+            fprintf(out, "res2 = tout_faire(compile_arbre(%s), None)\n\n", $1);
             fprintf(out,
-                "if egal(res1,res2):\n"
+                "if egal_union_find(res1,res2):\n"
                 "    print('EGAL')\n"
                 "else:\n"
                 "    print('NON EGAL')\n"
@@ -61,35 +67,54 @@ ligne:
 
 
 expr:
-    expr PLUS concat
+    expr PLUS produit
     {
         char *v = new_var();
-        fprintf(out, "%s = union(%s,%s)\n", v, $1, $3);
+        fprintf(out, "%s = (\"+\", %s, %s)\n", v, $1, $3);
         $$ = v;
     }
-  | expr concat
+  | expr produit
     {
         /* Concaténation implicite */
         char *v = new_var();
-        fprintf(out, "%s = concatenation(%s,%s)\n", v, $1, $2);
+        fprintf(out, "%s = (\".\", %s, %s)\n", v, $1, $2);
+        $$ = v;
+    }
+  | produit
+;
+
+produit:
+    produit AND concat {
+        char *v = new_var();
+        fprintf(out, "%s = (\"&\", %s, %s)\n", v, $1, $3);
         $$ = v;
     }
-  | concat
+  | produit MINUS concat {
+        char *v = new_var();
+        fprintf(out, "%s = (\"-\", %s, %s)\n", v, $1, $3);
+        $$ = v;
+    }
+  | concat { $$ = $1; }
 ;
 
 concat:
     concat DOT term {
         char *v = new_var();
-        fprintf(out, "%s = concatenation(%s,%s)\n", v, $1, $3);
+        fprintf(out, "%s = (\".\", %s, %s)\n", v, $1, $3);
         $$ = v;
     }
   | term { $$ = $1; }
 ;
 
 term:
-    atom STAR {
+    NOT term {
+        char *v = new_var();
+        fprintf(out, "%s = (\"~\", %s)\n", v, $2);
+        $$ = v;
+    }
+  | atom STAR {
         char *v = new_var();
-        fprintf(out, "%s = etoile(%s)\n", v, $1);
+        fprintf(out, "%s = (\"*\", %s)\n", v, $1);
         $$ = v;
     }
   | atom { $$ = $1; }
@@ -98,12 +123,12 @@ term:
 atom:
     CHAR {
         char *v = new_var();
-        fprintf(out, "%s = automate(\"%s\")\n", v, $1);
+        fprintf(out, "%s = \"%s\"\n", v, $1);
         $$ = v;
     }
   | EPS {
         char *v = new_var();
-        fprintf(out, "%s = automate(\"E\")\n", v);
+        fprintf(out, "%s = \"E\"\n", v);
         $$ = v;
     }
   | PAR_O expr PAR_F { $$ = $2; }
@@ -117,7 +142,10 @@ void yyerror(const char *s) {
 
 int main() {
     out = fopen("main.py","w");
-    fprintf(out,"from automate import *\n\n");
+    /* chaque règle écrit un noeud de l'arbre de parseur.analyse ; l'arbre
+       d'une ligne est compilé en une passe par compile_arbre, sans recopier
+       les automates des sous-expressions à chaque opérateur */
+    fprintf(out,"from automate import *\nfrom parseur import compile_arbre\n\n");
 
     yyparse(); // lit toutes les lignes d'expressions
 
@@ -0,0 +1,326 @@
+"""
+rendu des automates (images Graphviz) et rapport PDF
+
+graphviz et fpdf ne sont importés qu'au premier dessin ou au premier rapport
+(charge_rendu) : le noyau automate.py reste utilisable sans eux
+    from rendu import generer_rapport_pdf
+    generer_rapport_pdf()
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+import os
+import shutil
+import threading
+
+from automate import (automate, concatenation, union, etoile,
+                      supression_epsilon_transitions, tout_faire, egal)
+
+# =============================================================================
+# CONFIGURATION IMPORTANTE : LE CHEMIN VERS GRAPHVIZ
+# =============================================================================
+# Colle ici le chemin vers le dossier 'bin' de Graphviz que tu as trouvé.
+# Garde le 'r' devant les guillemets pour éviter les erreurs de caractères spéciaux.
+GRAPHVIZ_PATH = r'C:\Program Files\Graphviz\bin'
+
+# =============================================================================
+
+# images déjà rendues, nommées par l'empreinte de leur source dot
+REPERTOIRE_RENDUS = "rendus_cache"
+
+# rempli par charge_rendu() au premier usage
+GRAPHVIZ_AVAILABLE = None
+Digraph = FPDF = XPos = YPos = None
+_PDFReport = None
+
+# pool de fils des rendus, et rendus en cours par empreinte (un rendu
+# terminé en sort: l'image est alors dans REPERTOIRE_RENDUS)
+_executeur = None
+_en_cours = {}
+_verrou = threading.Lock()
+
+
+def check_graphviz():
+    """Vérifie si Graphviz (dot) est disponible"""
+    return shutil.which("dot") is not None
+
+
+def charge_rendu():
+    """ importe graphviz et fpdf au premier appel ; retourne True si le rendu
+        est possible (les avertissements ne sont affichés qu'une fois)
+    """
+    global GRAPHVIZ_AVAILABLE, Digraph, FPDF, XPos, YPos
+    if GRAPHVIZ_AVAILABLE is not None:
+        return GRAPHVIZ_AVAILABLE
+    # On ajoute ce chemin au système pour que Python le trouve (Windows)
+    if os.path.exists(GRAPHVIZ_PATH):
+        os.environ["PATH"] += os.pathsep + GRAPHVIZ_PATH
+    # Imports pour la génération de PDF et Graphes
+    try:
+        from graphviz import Digraph
+        from fpdf import FPDF
+        from fpdf.enums import XPos, YPos
+        GRAPHVIZ_AVAILABLE = True
+    except ImportError:
+        GRAPHVIZ_AVAILABLE = False
+        print("ATTENTION: graphviz ou fpdf non installés. Le PDF ne sera pas généré.")
+        print("Faites: pip install graphviz fpdf2")
+        return False
+    if not check_graphviz():
+        GRAPHVIZ_AVAILABLE = False
+        print("ATTENTION : Graphviz (dot) n'est pas installé ou introuvable.")
+        print(f"Vérifiez l'installation de Graphviz ou la variable GRAPHVIZ_PATH ({GRAPHVIZ_PATH}).")
+        print("Sous Ubuntu/WSL : sudo apt install graphviz")
+        print("Sous Windows : https://graphviz.org/download/")
+    return GRAPHVIZ_AVAILABLE
+
+
+def source_dot(a):
+    """ retourne le Digraph de l'automate a (sans le nom: deux automates
+        identiques ont la même source, donc la même image en cache)
+    """
+    dot = Digraph(format='png')
+    dot.attr(rankdir='LR') # De gauche à droite
+
+    # Point invisible pour pointer vers l'état initial (0)
+    dot.node('start', style='invisible', shape='point')
+    dot.edge('start', '0')
+
+    # Création des noeuds
+    finals = set(a.final)
+    for i in range(a.n):
+        if i in finals:
+            dot.node(str(i), shape='doublecircle') # Etat final
+        else:
+            dot.node(str(i), shape='circle') # Etat normal
+
+    # Création des arêtes (transitions), dans un ordre fixe
+    for (src, char), dests in sorted(a.transition.items(), key=lambda t: (t[0][0], str(t[0][1]))):
+        label = "ε" if char == "E" else str(char)
+        for dest in dests:
+            dot.edge(str(src), str(dest), label=label)
+    return dot
+
+
+def _rendu(dot, empreinte):
+    """ exécuté dans un fil du pool: lance dot si l'image n'est pas en cache """
+    try:
+        image = os.path.join(REPERTOIRE_RENDUS, empreinte + ".png")
+        if not os.path.exists(image):
+            os.makedirs(REPERTOIRE_RENDUS, exist_ok=True)
+            # rendu sous un nom temporaire puis renommage: une image
+            # interrompue n'est jamais prise pour une image du cache
+            temp = os.path.join(REPERTOIRE_RENDUS, "%s.%d" % (empreinte, threading.get_ident()))
+            os.replace(dot.render(temp, cleanup=True), image)
+        return image
+    except Exception as e:
+        print(f"\n[ERREUR] Impossible de générer l'image {empreinte}.")
+        print(f"Cause : {e}")
+        print("Vérifiez que le chemin GRAPHVIZ_PATH de rendu.py est correct.")
+        return None
+
+
+def _copie(image, filename):
+    """ copie l'image du cache sous filename.png (le nom que donnait Graphviz) """
+    if image is None:
+        return None
+    try:
+        output_path = filename + ".png"
+        shutil.copyfile(image, output_path)
+        return output_path
+    except OSError as e:
+        print(f"\n[ERREUR] Impossible d'écrire l'image {filename}.png : {e}")
+        return None
+
+
+def _pool():
+    global _executeur
+    if _executeur is None:
+        # les fils attendent surtout les processus dot: plus de fils que de coeurs
+        _executeur = ThreadPoolExecutor(max_workers=min(32, 2 * (os.cpu_count() or 2)))
+    return _executeur
+
+
+def _termine(empreinte, futur):
+    """ retire un rendu terminé de _en_cours: une image réussie est en
+        cache sur disque, un rendu en échec sera relancé à la demande suivante
+    """
+    with _verrou:
+        if _en_cours.get(empreinte) is futur:
+            del _en_cours[empreinte]
+
+
+def to_graphviz_futur(a, filename=None):
+    """ lance le rendu de l'automate a dans le pool de fils et retourne un
+        Future (chemin de l'image, ou None en cas d'erreur) ; l'image est
+        en cache dans REPERTOIRE_RENDUS sous l'empreinte de sa source dot,
+        et copiée sous filename.png si filename est donné
+    """
+    if not charge_rendu():
+        futur = Future()
+        futur.set_result(None)
+        return futur
+    # la source est construite tout de suite: a peut être modifié ensuite
+    dot = source_dot(a)
+    empreinte = hashlib.sha256(dot.source.encode("utf-8")).hexdigest()[:32]
+    with _verrou:
+        # un même graphe demandé pendant son rendu n'est rendu qu'une fois
+        image = _en_cours.get(empreinte)
+        nouveau = image is None
+        if nouveau:
+            image = _pool().submit(_rendu, dot, empreinte)
+            _en_cours[empreinte] = image
+    if nouveau:
+        # hors du verrou: le rappel est exécuté tout de suite si le rendu
+        # est déjà terminé
+        image.add_done_callback(lambda f: _termine(empreinte, f))
+    if filename is None:
+        return image
+    futur = Future()
+    image.add_done_callback(lambda f: futur.set_result(_copie(f.result(), filename)))
+    return futur
+
+
+def to_graphviz(a, filename):
+    """ Génère une image de l'automate a via Graphviz """
+    return to_graphviz_futur(a, filename).result()
+
+
+def rendus(automates):
+    """ lance le rendu de tous les automates (liste de paires (automate,
+        nom de fichier)) et retourne la liste des Future, dans le même ordre
+    """
+    return [to_graphviz_futur(a, filename) for a, filename in automates]
+
+
+# --- FONCTIONS POUR LE PDF ---
+
+def nouveau_rapport():
+    """ retourne un PDFReport vide (None si fpdf n'est pas disponible) ;
+        la classe, qui hérite de FPDF, n'est définie qu'au premier appel
+    """
+    global _PDFReport
+    if not charge_rendu():
+        return None
+    if _PDFReport is None:
+
+        class PDFReport(FPDF):
+            def header(self):
+                self.set_font('Helvetica', 'B', 15)
+                self.cell(0, 10, 'Rapport de Projet: Automates', border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+                self.ln(10)
+
+            def chapter_title(self, title):
+                self.set_font('Helvetica', 'B', 12)
+                self.set_fill_color(200, 220, 255)
+                self.cell(0, 6, title, border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L', fill=True)
+                self.ln(4)
+
+            def chapter_body(self, body):
+                self.set_font('Helvetica', '', 12)
+                self.multi_cell(0, 5, body)
+                self.ln()
+
+            def add_image(self, img_path, w=100):
+                # img_path peut être un Future de to_graphviz_futur: on
+                # n'attend que ce rendu, les suivants continuent dans le pool
+                if hasattr(img_path, "result"):
+                    img_path = img_path.result()
+                if img_path and os.path.exists(img_path):
+                    self.image(img_path, w=w)
+                    self.ln()
+                else:
+                    self.set_text_color(255, 0, 0)
+                    self.cell(0, 10, "Image introuvable (Erreur Graphviz)", border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+                    self.set_text_color(0, 0, 0)
+
+            def resultat(self, egaux):
+                result_text = "EGAL" if egaux else "NON EGAL"
+                if egaux:
+                    self.set_text_color(0, 100, 0)
+                else:
+                    self.set_text_color(150, 0, 0)
+                self.set_font('Helvetica', 'B', 14)
+                self.cell(0, 10, f"RESULTAT: {result_text}", border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+                self.set_text_color(0, 0, 0)
+
+        _PDFReport = PDFReport
+    return _PDFReport()
+
+
+def sauve_rapport(pdf, fichier="rapport_projet.pdf"):
+    """ écrit le PDF et affiche le message de fin """
+    pdf.output(fichier)
+    print("\n---------------------------------------------------------")
+    print("PDF généré avec succès : " + fichier)
+    print("---------------------------------------------------------")
+
+
+def generer_rapport_pdf():
+    pdf = nouveau_rapport()
+    if pdf is None:
+        print("Impossible de générer le PDF sans graphviz et fpdf")
+        return
+
+    # Création des automates de test
+    a = automate("a")
+    b = automate("b")
+
+    cat = concatenation(a, b)
+    uni = union(a, b)
+    st = etoile(a)
+    s = supression_epsilon_transitions(cat) # (a.b) sans epsilon
+    A = tout_faire(concatenation(etoile(union(a, b)), automate("c")))   # (a+b)* . c
+    B = tout_faire(union(concatenation(etoile(a), automate("c")), concatenation(etoile(b), automate("c"))))  # a*.c + b*.c
+
+    # tous les dessins sont lancés en parallèle ; le PDF est assemblé dans
+    # l'ordre, chaque image est placée dès que son rendu est terminé
+    cat_img, uni_img, st_img, s_img, A_img, B_img = rendus([
+        (cat, "graph_concat"), (uni, "graph_union"), (st, "graph_star"),
+        (s, "graph_no_eps"), (A, "graph_A"), (B, "graph_B")])
+
+    pdf.add_page()
+
+    # 1. Concaténation
+    pdf.chapter_title("1. Test Concatenation (a.b)")
+    pdf.chapter_body(f"Automate résultant de a.b :\n{cat}")
+    pdf.add_image(cat_img)
+
+    # 2. Union
+    pdf.chapter_title("2. Test Union (a+b)")
+    pdf.chapter_body(f"Automate résultant de a+b :\n{uni}")
+    pdf.add_image(uni_img)
+
+    # 3. Etoile
+    pdf.chapter_title("3. Test Etoile (a*)")
+    pdf.chapter_body(f"Automate résultant de a* :\n{st}")
+    pdf.add_image(st_img)
+
+    # 4. Suppression Epsilon
+    pdf.chapter_title("4. Suppression Epsilon sur a.b")
+    pdf.chapter_body(f"Automate sans epsilon :\n{s}")
+    pdf.add_image(s_img)
+
+    # 5. Test Egalité
+    pdf.add_page()
+    pdf.chapter_title("5. Test d'Egalite")
+
+    resultat = egal(A, B)
+
+    pdf.chapter_body("Comparaison de A = (a+b)*.c et B = a*.c + b*.c")
+    pdf.chapter_body("Automate A (minimisé) :")
+    pdf.add_image(A_img)
+    pdf.chapter_body("Automate B (minimisé) :")
+    pdf.add_image(B_img)
+    pdf.resultat(resultat)
+
+    # Sauvegarde
+    sauve_rapport(pdf)
+
+    # Nettoyage des fichiers temporaires (optionnel)
+    # for f in ["graph_concat.png", "graph_union.png", "graph_star.png", "graph_no_eps.png", "graph_A.png", "graph_B.png"]:
+    #    if os.path.exists(f): os.remove(f)
+
+
+if __name__ == "__main__":
+    print("=== Exécution des tests et génération du PDF ===")
+    generer_rapport_pdf()
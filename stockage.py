@@ -0,0 +1,229 @@
+"""
+stockage sur disque des automates minimaux, relu par mmap
+
+format (petit-boutiste, version 3):
+    en-tête (32 octets): "AUTOMIN\\0", version (u32), nombre d'entrées (u32),
+                         position de l'index (u64), réservé (u64)
+    entrées, chacune alignée sur 8 octets:
+        n (u32), k = nombre de symboles (u32), taille des symboles (u32), réservé (u32)
+        symboles en utf-8 (un caractère par symbole), complétés à un multiple de 4
+        finals: bitmap de n bits, complété à un multiple de 4 octets
+        table: n*k entiers (i32), table[q*k + s] = état d'arrivée ou -1
+    index: nombre d'entrées x (clef 16 octets, position de l'entrée u64),
+           trié par clef
+la clef d'une expression est l'empreinte de sa forme normale (voir cache.py) ;
+la version 3 a changé de clef: les fichiers de version 2 sont à reconstruire
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from automate import _VueTransitions, symboles_vers_octets, tout_faire
+from cache import empreinte, forme_et_empreintes
+from parseur import analyse, expression
+
+MAGIQUE = b"AUTOMIN\0"
+VERSION = 3
+_ENTETE = struct.Struct("<8sIIQQ")
+_ENTETE_ENTREE = struct.Struct("<IIII")
+_INDEX = struct.Struct("<16sQ")
+
+
+def clef(texte):
+    """ clef de stockage de l'expression texte (16 octets) """
+    forme, empreintes = forme_et_empreintes(analyse(texte))
+    return empreinte(forme, empreintes)
+
+
+def _complete(donnees, multiple):
+    return donnees + b"\0" * (-len(donnees) % multiple)
+
+
+def _entree(a):
+    """ octets d'une entrée pour l'automate déterministe a """
+    symboles = list(a.alphabet)
+    k = len(symboles)
+    texte_symboles = symboles_vers_octets(symboles)
+    bitmap = bytearray((a.n + 7) // 8)
+    for q in a.final:
+        bitmap[q >> 3] |= 1 << (q & 7)
+    table = [-1] * (a.n * k)
+    for q in range(a.n):
+        for s, c in enumerate(symboles):
+            dests = a.transition.get((q, c))
+            if dests:
+                table[q * k + s] = dests[0]
+    return b"".join([
+        _ENTETE_ENTREE.pack(a.n, k, len(texte_symboles), 0),
+        _complete(texte_symboles, 4),
+        _complete(bytes(bitmap), 4),
+        struct.pack("<%di" % len(table), *table),
+    ])
+
+
+def ecrit_stock(chemin, automates):
+    """ écrit le fichier chemin à partir de paires (expression, automate minimal)
+        le fichier est écrit à côté puis renommé: les lecteurs ne voient
+        jamais de fichier incomplet
+    """
+    index = {}
+    corps = []
+    position = _ENTETE.size
+    for texte, a in automates:
+        index[clef(texte)] = position
+        e = _complete(_entree(a), 8)
+        corps.append(e)
+        position += len(e)
+    entete = _ENTETE.pack(MAGIQUE, VERSION, len(index), position, 0)
+    temporaire = chemin + ".tmp"
+    with open(temporaire, "wb") as f:
+        f.write(entete)
+        f.writelines(corps)
+        for k in sorted(index):
+            f.write(_INDEX.pack(k, index[k]))
+    os.replace(temporaire, chemin)
+
+
+def construit_stock(chemin, textes):
+    """ compile chaque expression par tout_faire et écrit le fichier chemin """
+    ecrit_stock(chemin, ((t, tout_faire(expression(t))) for t in textes))
+
+
+class _VueFinalsBits:
+    """ vue en lecture seule des états finals stockés en bitmap """
+    __slots__ = ("_a",)
+
+    def __init__(self, a):
+        self._a = a
+
+    def __contains__(self, q):
+        return isinstance(q, int) and 0 <= q < self._a.n and \
+            (self._a.bitmap[q >> 3] >> (q & 7)) & 1 == 1
+
+    def __iter__(self):
+        return (q for q in range(self._a.n) if q in self)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, autre):
+        return list(self) == list(autre)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class automate_stocke:
+    """ automate déterministe lu directement dans le fichier (mmap), sans
+        construire de dico: transition et final sont des vues en lecture
+        seule, comme pour automate_compact
+    """
+    __slots__ = ("name", "n", "alphabet", "symboles", "_code", "bitmap", "table")
+
+    def __init__(self, donnees, position):
+        n, k, taille_symboles, _ = _ENTETE_ENTREE.unpack_from(donnees, position)
+        i = position + _ENTETE_ENTREE.size
+        self.name = ""
+        self.n = n
+        self.symboles = list(bytes(donnees[i:i + taille_symboles]).decode("utf-8"))
+        self.alphabet = list(self.symboles)
+        self._code = {c: s for s, c in enumerate(self.symboles)}
+        i += taille_symboles + (-taille_symboles % 4)
+        taille_bitmap = (n + 7) // 8
+        self.bitmap = donnees[i:i + taille_bitmap]
+        i += taille_bitmap + (-taille_bitmap % 4)
+        table = donnees[i:i + 4 * n * k].cast("i")
+        if sys.byteorder != "little":
+            table = array("i", table)
+            table.byteswap()
+        self.table = table
+
+    @property
+    def transition(self):
+        return _VueTransitions(self)
+
+    @property
+    def final(self):
+        return _VueFinalsBits(self)
+
+    def destinations(self, q, c):
+        """ liste des états atteints depuis q en lisant c """
+        s = self._code.get(c)
+        if s is None or not 0 <= q < self.n:
+            return []
+        d = self.table[q * len(self.symboles) + s]
+        return [] if d == -1 else [d]
+
+
+class Stock:
+    """ fichier d'automates minimaux ouvert en lecture par mmap
+        plusieurs processus peuvent ouvrir le même fichier
+    """
+
+    def __init__(self, chemin):
+        self._fichier = open(chemin, "rb")
+        self._mmap = mmap.mmap(self._fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        self._donnees = memoryview(self._mmap)
+        if len(self._donnees) < _ENTETE.size:
+            self.fermer()
+            raise ValueError(f"{chemin} n'est pas un fichier d'automates")
+        magique, version, nb, position_index, _ = _ENTETE.unpack_from(self._donnees)
+        if magique != MAGIQUE:
+            self.fermer()
+            raise ValueError(f"{chemin} n'est pas un fichier d'automates")
+        if version != VERSION:
+            self.fermer()
+            raise ValueError(f"version {version} du format non supportée (attendue {VERSION})")
+        self._nb = nb
+        self._index = position_index
+
+    def __len__(self):
+        return self._nb
+
+    def _clef(self, i):
+        p = self._index + i * _INDEX.size
+        return bytes(self._donnees[p:p + 16])
+
+    def _cherche(self, k):
+        """ position de l'entrée de clef k, ou None (recherche dichotomique dans l'index) """
+        bas, haut = 0, self._nb
+        while bas < haut:
+            milieu = (bas + haut) // 2
+            if self._clef(milieu) < k:
+                bas = milieu + 1
+            else:
+                haut = milieu
+        if bas < self._nb and self._clef(bas) == k:
+            return _INDEX.unpack_from(self._donnees, self._index + bas * _INDEX.size)[1]
+        return None
+
+    def __contains__(self, texte):
+        return self._cherche(clef(texte)) is not None
+
+    def get(self, texte):
+        """ automate minimal de l'expression texte, ou None si absente """
+        position = self._cherche(clef(texte))
+        if position is None:
+            return None
+        a = automate_stocke(self._donnees, position)
+        a.name = texte
+        return a
+
+    def fermer(self):
+        """ ferme le fichier; si des automates lus sont encore utilisés,
+            le mmap ne sera libéré qu'à leur destruction
+        """
+        self._donnees.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
@@ -0,0 +1,387 @@
+"""
+tests de non-régression: expressions aléatoires comparées à un oracle
+
+l'oracle calcule le langage d'un arbre par ensembles de mots de longueur au
+plus K ; les automates construits doivent reconnaître exactement ces mots
+    python3 -m pytest test_automates.py
+    python3 test_automates.py
+"""
+import io
+import itertools
+import json
+import os
+import random
+import tempfile
+
+from automate import (intersection, complement, difference, tout_faire, vide, union, egal,
+                      inclus, supression_epsilon_transitions, minimisation,
+                      minimisation_hopcroft, egal_union_find, egal_nfa, automate,
+                      automate_compact, compacter, determinisation, Statistiques,
+                      empreinte)
+from cache import CacheAutomates, expression_minimale
+from derivees import automate_derivees
+from parseur import (analyse, compare, expression, glushkov, automate_complet_arbre,
+                     ErreurSyntaxe)
+from reconnaissance import compile
+from stockage import Stock, construit_stock
+import cache
+import export_graph
+import lot
+import parseur
+import vectorise
+
+K = 5
+MOTS = ["".join(w) for l in range(K + 1) for w in itertools.product("abc", repeat=l)]
+
+
+def langage(arbre):
+    """ mots de longueur au plus K reconnus par l'arbre """
+    if isinstance(arbre, str):
+        return {""} if arbre == "E" else {arbre}
+    op = arbre[0]
+    if op == "~":
+        return set(MOTS) - langage(arbre[1])
+    if op == "*":
+        base = langage(arbre[1]) - {""}
+        res = front = {""}
+        while front:
+            front = {x + y for x in front for y in base if len(x) + len(y) <= K} - res
+            res = res | front
+        return res
+    g, d = langage(arbre[1]), langage(arbre[2])
+    if op == "+":
+        return g | d
+    if op == "&":
+        return g & d
+    if op == "-":
+        return g - d
+    return {x + y for x in g for y in d if len(x) + len(y) <= K}
+
+
+def aleatoire(hasard, profondeur, produits=True):
+    """ expression aléatoire (texte), avec &, - et ~ si produits """
+    if profondeur == 0 or hasard.random() < 0.2:
+        return hasard.choice("abcE")
+    op = hasard.choice("+.*&-~" if produits else "+.*")
+    e = aleatoire(hasard, profondeur - 1, produits)
+    if op == "*":
+        return "(" + e + ")*"
+    if op == "~":
+        return "~(" + e + ")"
+    return "(" + e + op + aleatoire(hasard, profondeur - 1, produits) + ")"
+
+
+def reconnus(a):
+    """ mots de longueur au plus K reconnus par l'automate a """
+    m = compile(tout_faire(a))
+    return {w for w in MOTS if m.accepte(w)}
+
+
+def test_produits_paresseux():
+    hasard = random.Random(5)
+    for _ in range(150):
+        x, y = aleatoire(hasard, 3), aleatoire(hasard, 3)
+        lx, ly = langage(analyse(x)), langage(analyse(y))
+        assert reconnus(intersection(expression(x), expression(y))) == lx & ly, (x, y)
+        assert reconnus(difference(expression(x), expression(y))) == lx - ly, (x, y)
+        assert reconnus(complement(expression(x), "abc")) == set(MOTS) - lx, x
+    # vide s'arrête sans construire le produit
+    grand = "(a+b)*.a" + ".(a+b)" * 14
+    p = intersection(expression(grand), expression("c.c"))
+    assert vide(p) and p._explore is None
+
+
+def test_lot():
+    paires = [("a+b", "b+a"), ("a", "b"), ("a.", "a"),
+              (intersection(expression("(a+b)*"), expression("a*")), expression("a*")),
+              (complement(expression("a")), difference(expression("(a+b+c)*"), expression("a")))]
+    res = list(lot.egalites(paires, processus=1, taille_lot=2))
+    assert res[:2] == [True, False]
+    assert res[2].startswith("Erreur syntaxe")
+    assert res[3:] == [True, True]
+    empreintes = list(lot.empreintes([intersection(expression("a*"), expression("(a.a)*")), "(a.a)*"], 1))
+    assert empreintes[0] == empreintes[1]
+
+
+def test_inclusion():
+    hasard = random.Random(23)
+    for i in range(300):
+        x = aleatoire(hasard, 3, produits=False)
+        y = aleatoire(hasard, 3, produits=False) if i % 3 else "(" + x + ")+" + aleatoire(hasard, 2)
+        a1, a2 = expression(x), expression(y)
+        r = inclus(a1, a2)
+        assert (r is None) == egal(tout_faire(union(expression(x), expression(y))),
+                                   tout_faire(expression(y))), (x, y)
+        if r is not None:
+            m1, m2 = compile(tout_faire(a1)), compile(tout_faire(a2))
+            assert m1.accepte(r) and not m2.accepte(r), (x, y, r)
+            # aucun contre-exemple plus court
+            assert not any(m1.accepte(w) and not m2.accepte(w) for w in MOTS if len(w) < len(r))
+    # le mot vide est un contre-exemple, distinct de None
+    assert inclus(expression("E+a"), expression("a")) == ""
+    assert inclus(expression("a"), expression("E+a")) is None
+
+
+def test_glushkov():
+    hasard = random.Random(7)
+    for i in range(250):
+        texte = aleatoire(hasard, 4, produits=False)
+        arbre = analyse(texte)
+        g = glushkov(arbre)
+        assert all(c != "E" for (_, c) in g.transition), texte
+        assert reconnus(g) == langage(arbre), texte
+        assert egal(automate_complet_arbre(arbre, "glushkov"),
+                    automate_complet_arbre(arbre, "thompson")), texte
+        if i % 10 == 0:
+            # au-delà du seuil, ensembles en set: même automate
+            seuil, parseur.SEUIL_BITS = parseur.SEUIL_BITS, 0
+            try:
+                s = glushkov(arbre)
+            finally:
+                parseur.SEUIL_BITS = seuil
+            assert (s.n, s.final, s.transition) == (g.n, g.final, g.transition), texte
+
+
+def test_constructions():
+    hasard = random.Random(24)
+    memoire = CacheAutomates()
+    for _ in range(250):
+        texte = aleatoire(hasard, 4)
+        arbre = analyse(texte)
+        attendu = langage(arbre)
+        a = expression(texte)
+        assert reconnus(a) == attendu, texte
+        assert reconnus(automate_derivees(arbre)) == attendu, texte
+        assert reconnus(expression_minimale(texte, memoire)) == attendu, texte
+        assert vide(a) == (tout_faire(expression(texte)).final == []), texte
+
+
+def imbrique(profondeur, motif="(a+(b.X+c).b)"):
+    """ motif dont X est remplacé par lui-même, profondeur fois (a au fond) """
+    avant, apres = motif.split("X")
+    texte = "a"
+    for _ in range(profondeur):
+        texte = avant + texte + apres
+    return texte
+
+
+def test_imbrication_profonde():
+    texte = "(" * 3000 + "a" + ")*" * 3000
+    assert compare(texte, "a*")
+    try:
+        analyse("(" * 3000)
+    except ErreurSyntaxe:
+        pass
+    else:
+        assert False
+    texte = imbrique(1500)
+    assert compare(texte, texte, "derivees")
+    # automates minimaux de taille bornée à chaque niveau
+    texte = imbrique(1500, "(a+(b.X+c)*.b)")
+    assert cache.compare(texte, texte, CacheAutomates())
+
+
+def test_stock():
+    profond = imbrique(1500, "(a+(b.X+c)*.b)")
+    textes = ["a+b", "(a.b)*", "a.~(b)", profond]
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "automates.bin")
+        construit_stock(chemin, textes)
+        with Stock(chemin) as stock:
+            assert len(stock) == 4
+            # même forme normale, même clef
+            assert "b+(a+b)" in stock and profond in stock and "a" not in stock
+            assert stock.get("c") is None
+            for t in textes[:3]:
+                assert reconnus(stock.get(t)) == langage(analyse(t)), t
+        with open(chemin, "r+b") as f:
+            f.seek(8)
+            f.write(b"\2")
+        try:
+            Stock(chemin)
+        except ValueError:
+            pass
+        else:
+            assert False
+
+
+def test_minimisations():
+    hasard = random.Random(10)
+    for _ in range(250):
+        a = supression_epsilon_transitions(expression(aleatoire(hasard, 4)))
+        moore = tout_faire(a, minimisation)
+        hopcroft = tout_faire(a, minimisation_hopcroft)
+        assert moore.n == hopcroft.n
+        assert egal(moore, hopcroft)
+        assert tout_faire(hopcroft).n == hopcroft.n
+
+
+def test_egalites():
+    hasard = random.Random(3)
+    for i in range(300):
+        x = aleatoire(hasard, 3, produits=False)
+        y = aleatoire(hasard, 3, produits=False) if i % 2 else "(" + x + ")+(" + x + ")"
+        # référence: produit des automates minimaux, vérifié sur les mots courts
+        oracle = egal(tout_faire(expression(x)), tout_faire(expression(y)))
+        assert oracle <= (langage(analyse(x)) == langage(analyse(y))), (x, y)
+        assert compare(x, y) == oracle, (x, y)
+        assert egal_union_find(tout_faire(expression(x), None),
+                               tout_faire(expression(y), None)) == oracle, (x, y)
+        assert egal_nfa(expression(x), expression(y)) == oracle, (x, y)
+        assert egal_nfa(expression(x), expression(y), congruence=True) == oracle, (x, y)
+
+
+def contenu(a):
+    """ (n, finals, alphabet, transitions non vides) de l'automate a """
+    return (a.n, sorted(a.final), list(a.alphabet),
+            {clef: list(a.transition[clef]) for clef in a.transition if a.transition[clef]})
+
+
+def test_compact():
+    hasard = random.Random(3)
+    for _ in range(100):
+        texte = aleatoire(hasard, 3, produits=False)
+        # avec epsilon transitions (CSR) puis déterministe (table)
+        for a in (expression(texte), tout_faire(expression(texte))):
+            c = compacter(a)
+            assert contenu(c) == contenu(a) == contenu(c.vers_automate()), texte
+            relu = automate_compact.depuis_octets(c.vers_octets())
+            assert relu.deterministe == c.deterministe and relu.name == c.name
+            assert contenu(relu) == contenu(c), texte
+    # symboles hors ASCII
+    c = compacter(automate("é", alphabet="aé"))
+    assert contenu(automate_compact.depuis_octets(c.vers_octets())) == contenu(c)
+
+
+def test_lignes_acceptees():
+    m = compile(tout_faire(expression("(a+b)*.c")))
+    donnees = b"abc\nc\r\nab\n\nabd\nbbac\r\n"
+    attendu = [b"abc", b"c", b"bbac"]
+    assert list(m.lignes_acceptees(io.BytesIO(donnees))) == attendu
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "mots.txt")
+        with open(chemin, "wb") as f:
+            f.write(donnees)
+        assert list(m.lignes_acceptees(chemin)) == attendu
+    assert m.fullmatch(memoryview(b"bac")) and not m.accepte("aé")
+    # aucun état utile: rien n'est reconnu, pas même le mot vide
+    assert not compile(tout_faire(expression("a&b"))).accepte("")
+
+
+def test_accepte_lot():
+    if not vectorise.NUMPY_AVAILABLE:
+        return
+    hasard = random.Random(17)
+    mots = MOTS + ["abd", "é", "abā"]
+    for _ in range(40):
+        texte = aleatoire(hasard, 3)
+        a = tout_faire(expression(texte))
+        attendu = [w in langage(analyse(texte)) for w in mots]
+        # chemin rapide (octets), puis tableau de numéros de symboles
+        assert vectorise.accepte_lot(a, mots).tolist() == attendu, texte
+        matrice = vectorise.matrice_transitions(a)
+        codes = vectorise.encode_mots(a, mots)
+        assert vectorise.accepte_lot(a, codes, matrice).tolist() == attendu, texte
+    # automate incomplet: les transitions manquantes mènent à l'état mort
+    a = determinisation(supression_epsilon_transitions(expression("a.b")))
+    assert vectorise.accepte_lot(a, ["ab", "a", "ba", ""]).tolist() == [True, False, False, False]
+
+
+def test_statistiques():
+    recues = []
+    stats = Statistiques(rappel=recues.append)
+    a = tout_faire(expression("(a+b)*.a.b"), stats=stats)
+    assert a.n == tout_faire(expression("(a+b)*.a.b")).n == 4
+    etapes = [m["etape"] for m in stats.etapes]
+    assert etapes == ["supression_epsilon", "determinisation", "completion", "minimisation"]
+    # chaque étape part de l'automate produit par la précédente
+    for avant, apres in zip(stats.etapes, stats.etapes[1:]):
+        assert avant["etats_sortie"] == apres["etats_entree"]
+    assert stats["minimisation"]["etats_sortie"] == a.n
+    assert "plus_grand_sous_ensemble" in stats["determinisation"]
+    b = tout_faire(expression("(a+b)*.b"))
+    assert not egal(a, b, stats=stats) and not egal_union_find(a, b, stats=stats)
+    assert stats["egal"]["resultat"] is False and stats["egal_union_find"]["etats_entree"] == [4, 3]
+    assert recues == stats.etapes
+    assert "determinisation" in str(stats)
+    try:
+        stats["glushkov"]
+    except KeyError:
+        pass
+    else:
+        assert False
+
+
+def test_export_graph():
+    a = tout_faire(expression("(a+b)*.c.c"))
+    e = expression("(a+b)*.c")
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "a")
+        # JSON-lines: relu, il redonne l'automate (epsilon compris)
+        paquet, export_graph.PAQUET = export_graph.PAQUET, 2
+        try:
+            export_graph.export_json(e, chemin)
+        finally:
+            export_graph.PAQUET = paquet
+        with open(chemin, encoding="utf-8") as f:
+            lignes = [json.loads(l) for l in f]
+        assert lignes[0] == {"name": e.name, "n": e.n, "initial": 0, "alphabet": ["a", "b", "c"]}
+        assert [l["final"] for l in lignes if "final" in l] == sorted(e.final)
+        relu = {}
+        for l in lignes:
+            for c in l.get("symboles", []):
+                relu.setdefault((l["de"], c), []).append(l["vers"])
+        assert relu == {clef: sorted(d) for clef, d in e.transition.items() if d}
+        # DOT complet: une arête par paire d'états, symboles fusionnés
+        export_graph.export_dot(a, chemin)
+        with open(chemin, encoding="utf-8") as f:
+            dot = f.read()
+        assert dot.count(" -> ") == 1 + len(list(export_graph.aretes(a)))
+        assert '[label="a,b"]' in dot and dot.count("doublecircle") == 1
+        # résumés au-delà du seuil
+        export_graph.export_dot(a, chemin, seuil=0)
+        with open(chemin, encoding="utf-8") as f:
+            dot = f.read()
+        assert f'label="{a.n} états, {a.n} composantes"' in dot
+        export_graph.export_dot(a, chemin, seuil=0, resume="degre", k=1)
+        with open(chemin, encoding="utf-8") as f:
+            dot = f.read()
+        assert dot.count("shape=circle") + dot.count("shape=doublecircle") <= 2
+        try:
+            export_graph.export_dot(a, chemin, seuil=0, resume="tout")
+        except ValueError:
+            pass
+        else:
+            assert False
+        export_graph.export_aretes(a, chemin)
+        with open(chemin, encoding="utf-8") as f:
+            assert len(f.readlines()) == len(list(export_graph.aretes(a)))
+
+
+def test_empreintes():
+    hasard = random.Random(25)
+    textes = [aleatoire(hasard, 3) for _ in range(120)]
+    minimaux = [tout_faire(expression(t)) for t in textes]
+    empreintes = [empreinte(m) for m in minimaux]
+    for i in range(len(textes)):
+        for j in range(i + 1, len(textes)):
+            assert (empreintes[i] == empreintes[j]) == egal(minimaux[i], minimaux[j])
+    # indépendantes de la numérotation des états et de l'ordre de l'alphabet
+    for m, e in zip(minimaux, empreintes):
+        ordre = list(range(1, m.n))
+        hasard.shuffle(ordre)
+        numero = [0] + ordre
+        b = automate(alphabet="cab")
+        b.n = m.n
+        b.final = [numero[q] for q in m.final]
+        for (q, c), dests in m.transition.items():
+            b.transition[(numero[q], c)] = [numero[dests[0]]]
+        assert empreinte(b) == e
+        assert empreinte(compacter(m)) == e
+
+
+if __name__ == "__main__":
+    for nom, test in list(globals().items()):
+        if nom.startswith("test_"):
+            test()
+            print(nom, "ok")
@@ -0,0 +1,158 @@
+"""
+test d'appartenance d'un grand nombre de mots à la fois, avec NumPy
+
+tous les mots avancent ensemble dans l'automate déterministe: une seule
+lecture vectorisée de la table de transitions par position
+    accepte_lot(completion(determinisation(a)), ["ab", "abc", ""])
+numpy est une dépendance optionnelle: le module s'importe sans lui, et
+seules les fonctions ci-dessous lèvent une erreur s'il manque
+"""
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def _verifie_numpy():
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("vectorise nécessite numpy: pip install numpy")
+
+
+def matrice_transitions(a):
+    """ retourne (T, acceptant) pour l'automate déterministe a à n états et
+        k symboles (ceux de a.alphabet, dans l'ordre):
+        T de forme (n+1, k+2): colonnes 0..k-1 pour les symboles, k pour le
+        remplissage (on reste sur place), k+1 pour un symbole inconnu;
+        la ligne n est un état mort (transitions manquantes)
+        acceptant: tableau de booléens de taille n+1
+        (à calculer une fois et passer à accepte_lot pour plusieurs lots)
+    """
+    _verifie_numpy()
+    n = a.n
+    k = len(a.alphabet)
+    mort = n
+    T = np.full((n + 1, k + 2), mort, dtype=np.int32)
+    T[:, k] = np.arange(n + 1, dtype=np.int32)
+    code = {c: s for s, c in enumerate(a.alphabet)}
+    # un seul parcours des transitions, puis une affectation vectorisée
+    lignes, colonnes, dests = [], [], []
+    for (q, c), d in a.transition.items():
+        s = code.get(c)
+        if s is not None and d:
+            lignes.append(q)
+            colonnes.append(s)
+            dests.append(d[0])
+    T[lignes, colonnes] = dests
+    acceptant = np.zeros(n + 1, dtype=bool)
+    acceptant[list(a.final)] = True
+    return T, acceptant
+
+
+def _table_octets(a):
+    """ table de traduction (bytes.translate) octet -> colonne de T, ou None
+        si un symbole n'est pas un octet
+    """
+    k = len(a.alphabet)
+    if k + 1 >= 256:
+        return None
+    table = bytearray([k + 1]) * 256
+    for s, c in enumerate(a.alphabet):
+        o = ord(c)
+        if o >= 256:
+            return None
+        table[o] = s
+    return bytes(table)
+
+
+def _octets(mots):
+    """ retourne (donnees, longueurs): les mots mis bout à bout en bytes et
+        leurs longueurs, ou None si l'un d'eux ne s'écrit pas en octets
+    """
+    try:
+        # cas courant: que des chaînes, un seul encodage pour tout le lot
+        donnees = "".join(mots).encode("latin-1")
+    except UnicodeEncodeError:
+        return None
+    except TypeError:
+        if not all(isinstance(m, (str, bytes, bytearray)) for m in mots):
+            return None
+        try:
+            mots = [m.encode("latin-1") if isinstance(m, str) else m for m in mots]
+        except UnicodeEncodeError:
+            return None
+        donnees = b"".join(mots)
+    return donnees, np.fromiter(map(len, mots), dtype=np.intp, count=len(mots))
+
+
+def encode_mots(a, mots):
+    """ retourne le tableau (nombre de mots, longueur max) des numéros de
+        symboles de chaque mot (indice dans a.alphabet), complété par -1;
+        un symbole hors de l'alphabet est codé len(a.alphabet)
+    """
+    _verifie_numpy()
+    k = len(a.alphabet)
+    table = _table_octets(a)
+    octets = _octets(mots) if table is not None else None
+    if octets is not None:
+        # chemin rapide: mots mis bout à bout et traduits d'un coup
+        donnees, longueurs = octets
+        plat = np.frombuffer(donnees.translate(table), dtype=np.uint8).astype(np.int32)
+        plat[plat == k + 1] = k
+        res = np.full((len(longueurs), int(longueurs.max(initial=0))), -1, dtype=np.int32)
+        # le masque est parcouru ligne par ligne: dans l'ordre des mots
+        res[np.arange(res.shape[1]) < longueurs[:, None]] = plat
+        return res
+    code = {c: s for s, c in enumerate(a.alphabet)}
+    longueur = max((len(m) for m in mots), default=0)
+    res = np.full((len(mots), longueur), -1, dtype=np.int32)
+    for i, m in enumerate(mots):
+        res[i, :len(m)] = [code.get(c, k) for c in m]
+    return res
+
+
+def accepte_lot(a, mots, matrice=None):
+    """ retourne le tableau de booléens: mots[i] est-il reconnu par a ?
+        a: automate déterministe (determinisation, éventuellement completion)
+        mots: liste de mots, ou tableau NumPy (nombre de mots, longueur) des
+        numéros de symboles complété par -1 (voir encode_mots)
+        matrice: résultat de matrice_transitions(a), s'il est déjà calculé
+    """
+    _verifie_numpy()
+    k = len(a.alphabet)
+    T, acceptant = matrice if matrice is not None else matrice_transitions(a)
+    largeur = k + 2
+    # table plate, états déjà multipliés par largeur: q' = plat[q + colonne]
+    plat = T.ravel().astype(np.intp) * largeur
+    table = _table_octets(a) if not isinstance(mots, np.ndarray) else None
+    octets = _octets(mots) if table is not None else None
+    if octets is None:
+        if not isinstance(mots, np.ndarray):
+            mots = encode_mots(a, mots)
+        # -1 (remplissage) -> colonne k, symbole inconnu (>= k) -> colonne k+1 ;
+        # une ligne contiguë par position
+        colonnes = np.ascontiguousarray(
+            np.where(mots < 0, k, np.where(mots >= k, k + 1, mots)).T, dtype=np.intp)
+        q = np.zeros(mots.shape[0], dtype=np.intp)
+        for ligne in colonnes:
+            q += ligne
+            q = plat[q]
+        return acceptant[q // largeur]
+    # chemin rapide: mots triés par longueur décroissante, la position j
+    # n'avance que les mots de longueur > j (un préfixe du tableau) ; chaque
+    # symbole est lu une fois, sans remplissage
+    donnees, longueurs = octets
+    nb = len(longueurs)
+    ordre = np.argsort(-longueurs, kind="stable")
+    symboles = np.frombuffer(donnees.translate(table), dtype=np.uint8)
+    position = (np.cumsum(longueurs) - longueurs)[ordre]
+    actifs = nb - np.cumsum(np.bincount(longueurs, minlength=1))
+    q = np.zeros(nb, dtype=np.intp)
+    for j in range(len(actifs) - 1):
+        m = actifs[j]
+        q[:m] += symboles[position[:m]]
+        q[:m] = plat[q[:m]]
+        position[:m] += 1
+    res = np.empty(nb, dtype=bool)
+    res[ordre] = acceptant[q // largeur]
+    return res